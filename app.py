@@ -1,12 +1,36 @@
 import streamlit as st
+import threading
 import time
-from utils import get_boto3_client, TAG_KEY, TAG_VALUE
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError, WaiterError
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from utils import get_boto3_client, is_managed, TAG_KEY, TAG_VALUE
 import json
 
-ec2_client = get_boto3_client('ec2')
-s3_client = get_boto3_client('s3')
-r53_client = get_boto3_client('route53')
-ssm_client = get_boto3_client('ssm')
+# Max parallel AWS calls when scanning tags (must stay below the client connection pool size)
+SCAN_WORKERS = 16
+# Max buckets/zones deleted at the same time by the Nuke button
+NUKE_WORKERS = 8
+
+# How long (seconds) the EC2 inventory is cached between AWS calls
+INSTANCE_CACHE_TTL = 15
+
+# Every EC2 state except 'terminated'
+LIVE_STATES = ['pending', 'running', 'shutting-down', 'stopping', 'stopped']
+
+# JMESPath projection: one flat dict per instance, with defaults for missing Name tag / IP
+INSTANCE_QUERY = (
+    "Reservations[].Instances[].{"
+    "id: InstanceId, "
+    "name: Tags[?Key=='Name'] | [0].Value || 'Unknown', "
+    "state: State.Name, "
+    "ip: PublicIpAddress || 'N/A', "
+    "type: InstanceType}"
+)
+
+# Status icon per EC2 state (anything in transition is yellow)
+STATE_ICONS = {"running": "🟢", "stopped": "🔴"}
 
 # --- 1. Page Configuration (Tab title, icon, layout) ---
 st.set_page_config(
@@ -16,6 +40,300 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
+# --- AWS Clients (get_boto3_client caches them per process, so reruns reuse them) ---
+ec2_client = get_boto3_client('ec2')
+s3_client = get_boto3_client('s3')
+r53_client = get_boto3_client('route53')
+tagging_client = get_boto3_client('resourcegroupstaggingapi')
+# Route53 is a global service - its tags are only visible to the tagging API in us-east-1
+global_tagging_client = get_boto3_client('resourcegroupstaggingapi', 'us-east-1')
+
+
+# --- Tag Scan Helpers (run inside a thread pool) ---
+def bucket_is_ours(bucket_name):
+    """Returns True if the bucket carries our CreatedBy tag (False on missing tags/access errors)."""
+    try:
+        tags = s3_client.get_bucket_tagging(Bucket=bucket_name)
+        return is_managed(tags['TagSet'])
+    except Exception:
+        return False
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_public_access(bucket_name):
+    """
+    Returns True if the bucket blocks public policies, False if it allows them,
+    or None if it has no public access block at all.
+    The setting only changes when we create a bucket, so it is cached for 5 minutes.
+    """
+    try:
+        pab = s3_client.get_public_access_block(Bucket=bucket_name)
+        return pab['PublicAccessBlockConfiguration']['BlockPublicPolicy']
+    except Exception:
+        return None
+
+
+# Route53 accepts up to 10 zone IDs per list_tags_for_resources call
+R53_TAG_BATCH = 10
+
+
+def get_zone_tags(zone_ids):
+    """
+    Fetches the tags of many Hosted Zones using the batch API.
+    Returns a dict of {zone_id: [tags]} - one HTTP call per 10 zones, sent in parallel.
+    """
+    chunks = [zone_ids[i:i + R53_TAG_BATCH] for i in range(0, len(zone_ids), R53_TAG_BATCH)]
+
+    def fetch(chunk):
+        return r53_client.list_tags_for_resources(ResourceType='hostedzone', ResourceIds=chunk)
+
+    zone_tags = {}
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as ex:
+        for resp in ex.map(fetch, chunks):
+            for tag_set in resp['ResourceTagSets']:
+                zone_tags[tag_set['ResourceId']] = tag_set['Tags']
+    return zone_tags
+
+
+# S3 accepts up to 1000 keys per delete_objects call
+S3_DELETE_BATCH = 1000
+# Parallel delete_objects calls per bucket (the Nuke also runs several buckets at once)
+S3_DELETE_WORKERS = 4
+# Short poll so the refreshed bucket list never shows a just-deleted bucket
+BUCKET_GONE_WAIT = {'Delay': 1, 'MaxAttempts': 5}
+# Route53 accepts up to 1000 changes per change_resource_record_sets call
+R53_CHANGE_BATCH = 1000
+
+# Uploads below this size go out as a single put_object (no multipart round trips)
+MB = 1024 * 1024
+MULTIPART_THRESHOLD = 8 * MB
+UPLOAD_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=16 * MB,
+    max_concurrency=8,
+    use_threads=True
+)
+
+
+def empty_bucket(bucket_name):
+    """
+    Deletes every object version and delete marker in a bucket.
+    Uses delete_objects so each call removes up to 1000 keys instead of one,
+    and sends the batches in parallel while the next listing page is fetched.
+    """
+    paginator = s3_client.get_paginator('list_object_versions')
+
+    with ThreadPoolExecutor(max_workers=S3_DELETE_WORKERS) as ex:
+        futures = []
+        for page in paginator.paginate(Bucket=bucket_name):
+            entries = page.get('Versions', []) + page.get('DeleteMarkers', [])
+            to_delete = [{'Key': v['Key'], 'VersionId': v['VersionId']} for v in entries]
+
+            for i in range(0, len(to_delete), S3_DELETE_BATCH):
+                futures.append(ex.submit(
+                    s3_client.delete_objects,
+                    Bucket=bucket_name,
+                    Delete={'Objects': to_delete[i:i + S3_DELETE_BATCH], 'Quiet': True}
+                ))
+
+        # Surface the first failure (if any)
+        for future in futures:
+            future.result()
+
+
+def delete_bucket_fully(bucket_name):
+    """Empties a bucket (all versions) and then deletes it."""
+    empty_bucket(bucket_name)
+    s3_client.delete_bucket(Bucket=bucket_name)
+
+
+def wait_until_bucket_gone(bucket_name):
+    """
+    Waits briefly for a deleted bucket to drop out of listings.
+    The delete itself already worked - if S3 is slow, say so instead of failing.
+    """
+    try:
+        s3_client.get_waiter('bucket_not_exists').wait(Bucket=bucket_name, WaiterConfig=BUCKET_GONE_WAIT)
+    except WaiterError:
+        st.toast(f"⏳ {bucket_name} was deleted, but may still be listed for a moment.")
+
+
+def delete_zone_fully(zone_id):
+    """Deletes all custom records in a Hosted Zone and then the zone itself."""
+    # 1. List all records (paginated - a single call stops at 300 records)
+    pages = r53_client.get_paginator('list_resource_record_sets').paginate(HostedZoneId=zone_id)
+
+    # 2. Delete all non-default records (A, CNAME, etc.) in as few change batches as possible
+    # Skip default records (SOA and NS) - AWS manages these
+    changes = [{'Action': 'DELETE', 'ResourceRecordSet': rec}
+               for rec in pages.search('ResourceRecordSets[]') if rec['Type'] not in ['SOA', 'NS']]
+
+    for i in range(0, len(changes), R53_CHANGE_BATCH):
+        r53_client.change_resource_record_sets(
+            HostedZoneId=zone_id,
+            ChangeBatch={'Changes': changes[i:i + R53_CHANGE_BATCH]}
+        )
+
+    # 3. Now delete the Zone (it should be empty of custom records)
+    r53_client.delete_hosted_zone(Id=zone_id)
+
+
+@st.cache_data(ttl=INSTANCE_CACHE_TTL, show_spinner=False)
+def list_managed_instances():
+    """
+    Returns all EC2 instances created by this tool as simple dicts.
+    Cached for a few seconds - call list_managed_instances.clear() after launching.
+    """
+    paginator = ec2_client.get_paginator('describe_instances')
+    pages = paginator.paginate(
+        Filters=[
+            {'Name': f'tag:{TAG_KEY}', 'Values': [TAG_VALUE]},
+            # Terminated instances linger for ~1h - let AWS drop them instead of downloading them
+            {'Name': 'instance-state-name', 'Values': LIVE_STATES}
+        ],
+        # Max page size (MaxResults=1000) - large accounts stream in as few calls as possible
+        PaginationConfig={'PageSize': 1000}
+    )
+
+    # Flatten Reservations -> Instances and pick only the fields we show (handles all pages)
+    return list(pages.search(INSTANCE_QUERY))
+
+
+def set_expected_state(instance_ids, state):
+    """
+    Remembers the state we just asked AWS for (e.g. 'stopping').
+    The UI shows it right away instead of re-describing the instances.
+    """
+    expected = st.session_state.setdefault('ec2_expected_state', {})
+    for instance_id in instance_ids:
+        expected[instance_id] = (state, time.time())
+
+
+def apply_expected_states(instances):
+    """Overlays recently requested states on top of the (possibly cached) inventory."""
+    expected = st.session_state.get('ec2_expected_state', {})
+    now = time.time()
+
+    result = []
+    for inst in instances:
+        state, requested_at = expected.get(inst['id'], (None, 0))
+        # Once the cache has had time to refresh, trust AWS again
+        if state and now - requested_at < INSTANCE_CACHE_TTL:
+            inst = {**inst, 'state': state}
+        result.append(inst)
+    return result
+
+
+def list_all_hosted_zones():
+    """Returns every Hosted Zone in the account (a single call stops at 100 zones)."""
+    paginator = r53_client.get_paginator('list_hosted_zones')
+    return [z for page in paginator.paginate() for z in page['HostedZones']]
+
+
+def get_tagged_arns(resource_type):
+    """
+    Asks the Resource Groups Tagging API for every resource of this type carrying our tag.
+    One paginated call replaces the list + per-resource tag lookups.
+    """
+    client = global_tagging_client if resource_type.startswith('route53') else tagging_client
+    paginator = client.get_paginator('get_resources')
+    pages = paginator.paginate(
+        TagFilters=[{'Key': TAG_KEY, 'Values': [TAG_VALUE]}],
+        ResourceTypeFilters=[resource_type]
+    )
+    return [r['ResourceARN'] for page in pages for r in page['ResourceTagMappingList']]
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_managed_bucket_names():
+    """Returns the names of all buckets created by this tool (cached for 60s)."""
+    # S3 is the source of truth for which buckets exist - the tagging API
+    # keeps reporting deleted buckets for a while. Asking with a page size
+    # makes S3 include each bucket's region.
+    paginator = s3_client.get_paginator('list_buckets')
+    buckets = [b for page in paginator.paginate(PaginationConfig={'PageSize': 10000}) for b in page['Buckets']]
+    try:
+        # ARN format: arn:aws:s3:::<bucket_name>
+        tagged = {arn.split(':::')[-1] for arn in get_tagged_arns('s3')}
+    except ClientError:
+        # No tag:GetResources permission - fall back to checking every bucket's tags
+        tagged = None
+
+    # The tagging API only sees buckets in its own region - buckets from any
+    # other (or unknown) region still need their own tag check
+    region = tagging_client.meta.region_name
+    ours = {b['Name'] for b in buckets if tagged is not None and b['Name'] in tagged}
+    to_check = [b['Name'] for b in buckets
+                if b['Name'] not in ours and (tagged is None or b.get('BucketRegion') != region)]
+    if to_check:
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as ex:
+            ownership = list(ex.map(bucket_is_ours, to_check))
+        ours.update(name for name, is_ours in zip(to_check, ownership) if is_ours)
+    return [b['Name'] for b in buckets if b['Name'] in ours]
+
+
+def get_managed_zone_ids():
+    """Returns the IDs of all Hosted Zones created by this tool."""
+    try:
+        # ARN format: arn:aws:route53:::hostedzone/<zone_id>
+        return {arn.split('/')[-1] for arn in get_tagged_arns('route53:hostedzone')}
+    except ClientError:
+        zone_ids = [z['Id'].split('/')[-1] for z in list_all_hosted_zones()]
+        zone_tags = get_zone_tags(zone_ids)
+        return {
+            z_id for z_id in zone_ids
+            if is_managed(zone_tags.get(z_id))
+        }
+
+
+# Public SSM parameters that always point at the latest official image
+AMI_SSM_PARAMS = {
+    "Amazon Linux 2023": '/aws/service/ami-amazon-linux-latest/al2023-ami-kernel-default-x86_64',
+    "Ubuntu 24.04 LTS": '/aws/service/canonical/ubuntu/server/24.04/stable/current/amd64/hvm/ebs-gp3/ami-id',
+}
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_latest_ami(os_type):
+    """
+    Returns the newest AMI ID for the chosen OS.
+    AMIs are published at most daily, so the result is cached for an hour.
+    """
+    # One tiny SSM lookup instead of downloading and sorting every matching AMI.
+    # SSM is only needed here (Launch form) - the client is built on first use
+    param = get_boto3_client('ssm').get_parameter(Name=AMI_SSM_PARAMS[os_type])
+    return param['Parameter']['Value']
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_managed_zones():
+    """Returns [{'id', 'name'}] for every Hosted Zone created by this tool (cached for 60s)."""
+    managed_zone_ids = get_managed_zone_ids()
+
+    # One list call gives us the zone names; keep only ours
+    zones = []
+    for z in list_all_hosted_zones():
+        z_id = z['Id'].split('/')[-1]
+        if z_id in managed_zone_ids:
+            zones.append({'id': z_id, 'name': z['Name']})
+    return zones
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def list_zone_records(zone_id):
+    """Returns every record set in a Hosted Zone (cached for 30s, per zone)."""
+    pages = r53_client.get_paginator('list_resource_record_sets').paginate(HostedZoneId=zone_id)
+    return list(pages.search('ResourceRecordSets[]'))
+
+
+def clear_inventory_caches():
+    """Drops the cached EC2/S3/Route53 listings so the next render refetches them."""
+    list_managed_instances.clear()
+    get_managed_bucket_names.clear()
+    get_managed_zones.clear()
+
+
 # --- 2. Sidebar Design ---
 st.sidebar.title("🎮 Control Panel")
 st.sidebar.markdown("---")
@@ -27,6 +345,9 @@ menu = st.sidebar.radio(
 )
 
 st.sidebar.markdown("---")
+# Listings are cached between clicks - this forces a fresh scan on any page
+if st.sidebar.button("🔄 Refresh"):
+    clear_inventory_caches()
 st.sidebar.caption(f"Project: {TAG_VALUE}")
 st.sidebar.caption("Status: Connected 🟢")
 
@@ -41,84 +362,71 @@ st.divider()  # A visual line separator
 # ==========================================
 #            STEP 1: DASHBOARD (Overview)
 # ==========================================
-if menu == "🏠 Dashboard":
+@st.fragment
+def dashboard_page():
+    """Overview of every managed resource + the Nuke button."""
     st.header("📊 Project Status Dashboard")
     st.markdown("Real-time overview of all resources managed by **Ofek CLI**.")
 
     if st.button("🔄 Refresh Data"):
-        st.rerun()
+        clear_inventory_caches()
+        st.rerun(scope="fragment")
 
     # --- Data Collection (Scan Everything) ---
     with st.spinner("Scanning AWS environment..."):
+        # The three services are independent - scan them at the same time.
+        # Workers get this session's script context so st.cache_data works inside them.
+        ctx = get_script_run_ctx()
+        with ThreadPoolExecutor(max_workers=3, initializer=add_script_run_ctx, initargs=(None, ctx)) as ex:
+            f_ec2 = ex.submit(list_managed_instances)
+            f_s3 = ex.submit(get_managed_bucket_names)
+            f_r53 = ex.submit(get_managed_zones)
+
         all_resources = []
 
         # 1. Scan EC2
         ec2_count = 0
         try:
             # Get only our tagged instances
-            e_resp = ec2_client.describe_instances(Filters=[{'Name': f'tag:{TAG_KEY}', 'Values': [TAG_VALUE]}])
-            for r in e_resp['Reservations']:
-                for i in r['Instances']:
-                    if i['State']['Name'] == 'terminated': continue  # Skip dead ones
-
-                    name = next((t['Value'] for t in i.get('Tags', []) if t['Key'] == 'Name'), "Unknown")
-                    all_resources.append({
-                        "Type": "🖥️ EC2",
-                        "Name": name,
-                        "ID": i['InstanceId'],
-                        "Status": i['State']['Name'].upper(),
-                        "Details": i.get('PublicIpAddress', 'No IP'),
-                        "Raw": i  # Keep raw object for deletion logic
-                    })
-                    ec2_count += 1
+            for inst in f_ec2.result():
+                all_resources.append({
+                    "Type": "🖥️ EC2",
+                    "Name": inst['name'],
+                    "ID": inst['id'],
+                    "Status": inst['state'].upper(),
+                    "Details": inst['ip']
+                })
+                ec2_count += 1
         except Exception as e:
             st.error(f"EC2 Scan Error: {e}")
 
         # 2. Scan S3
         s3_count = 0
         try:
-            s_resp = s3_client.list_buckets()
-            for b in s_resp['Buckets']:
-                try:
-                    # Must check tags individually
-                    tags = s3_client.get_bucket_tagging(Bucket=b['Name'])
-                    is_ours = any(t['Key'] == TAG_KEY and t['Value'] == TAG_VALUE for t in tags['TagSet'])
-                    if is_ours:
-                        all_resources.append({
-                            "Type": "📦 S3",
-                            "Name": b['Name'],
-                            "ID": "-",
-                            "Status": "ACTIVE",
-                            "Details": "Encrypted"
-                        })
-                        s3_count += 1
-                except:
-                    continue
+            for b_name in f_s3.result():
+                all_resources.append({
+                    "Type": "📦 S3",
+                    "Name": b_name,
+                    "ID": "-",
+                    "Status": "ACTIVE",
+                    "Details": "Encrypted"
+                })
+                s3_count += 1
         except Exception as e:
             st.error(f"S3 Scan Error: {e}")
 
         # 3. Scan Route53
         r53_count = 0
         try:
-            r_resp = r53_client.list_hosted_zones()
-            for z in r_resp['HostedZones']:
-                try:
-                    z_id = z['Id'].split('/')[-1]
-                    t_resp = r53_client.list_tags_for_resource(ResourceType='hostedzone', ResourceId=z_id)
-                    is_ours = any(
-                        t['Key'] == TAG_KEY and t['Value'] == TAG_VALUE for t in t_resp['ResourceTagSet']['Tags'])
-
-                    if is_ours:
-                        all_resources.append({
-                            "Type": "🌐 Route53",
-                            "Name": z['Name'],
-                            "ID": z_id,
-                            "Status": "ACTIVE",
-                            "Details": "Hosted Zone"
-                        })
-                        r53_count += 1
-                except:
-                    continue
+            for z in f_r53.result():
+                all_resources.append({
+                    "Type": "🌐 Route53",
+                    "Name": z['name'],
+                    "ID": z['id'],
+                    "Status": "ACTIVE",
+                    "Details": "Hosted Zone"
+                })
+                r53_count += 1
         except Exception as e:
             st.error(f"Route53 Scan Error: {e}")
 
@@ -137,11 +445,8 @@ if menu == "🏠 Dashboard":
     if not all_resources:
         st.info("✨ Environment is clean. No active resources found.")
     else:
-        # Prepare data for display (exclude raw objects)
-        display_data = [{k: v for k, v in r.items() if k != 'Raw'} for r in all_resources]
-
         st.dataframe(
-            display_data,
+            all_resources,
             column_config={
                 "Type": st.column_config.TextColumn("Resource Type", width="small"),
                 "Name": st.column_config.TextColumn("Resource Name", width="medium"),
@@ -171,7 +476,7 @@ if menu == "🏠 Dashboard":
             # CANCEL
             if c_no.button("Cancel"):
                 st.session_state['confirm_nuke'] = False
-                st.rerun()
+                st.rerun(scope="fragment")
 
             # EXECUTE (The "Kill" Logic)
             if c_yes.button("Yes, Destroy Everything 💥"):
@@ -179,74 +484,52 @@ if menu == "🏠 Dashboard":
                 status_text = st.empty()
                 total_items = len(all_resources)
                 current_item = 0
+                failures = 0
+                # Redraw the progress at most ~20 times - every redraw is a websocket message
+                update_every = max(1, total_items // 20)
 
                 try:
-                    for resource in all_resources:
-                        current_item += 1
-                        progress = current_item / total_items
-                        progress_bar.progress(progress)
-
-                        r_type = resource['Type']
-                        r_name = resource['Name']
-                        r_id = resource['ID']
-
-                        status_text.text(f"Deleting {r_type}: {r_name}...")
-
-                        # --- DELETE EC2 ---
-                        if "EC2" in r_type:
-                            ec2_client.terminate_instances(InstanceIds=[r_id])
-
-                        # --- DELETE S3 (Recursive) ---
-                        elif "S3" in r_type:
-                            # Empty Objects
-                            objs = s3_client.list_objects_v2(Bucket=r_name)
-                            if 'Contents' in objs:
-                                for obj in objs['Contents']:
-                                    s3_client.delete_object(Bucket=r_name, Key=obj['Key'])
-                            # Empty Versions
-                            vers = s3_client.list_object_versions(Bucket=r_name)
-                            if 'Versions' in vers:
-                                for v in vers['Versions']:
-                                    s3_client.delete_object(Bucket=r_name, Key=v['Key'], VersionId=v['VersionId'])
-                            if 'DeleteMarkers' in vers:
-                                for dm in vers['DeleteMarkers']:
-                                    s3_client.delete_object(Bucket=r_name, Key=dm['Key'], VersionId=dm['VersionId'])
-                            # Delete Bucket
-                            s3_client.delete_bucket(Bucket=r_name)
-
-                        # --- DELETE ROUTE53 (Recursive) ---
-                        elif "Route53" in r_type:
+                    # 1. EC2: one batched call terminates every instance
+                    instance_ids = [r['ID'] for r in all_resources if "EC2" in r['Type']]
+                    if instance_ids:
+                        status_text.text(f"Terminating {len(instance_ids)} EC2 instance(s)...")
+                        ec2_client.terminate_instances(InstanceIds=instance_ids)
+                        current_item += len(instance_ids)
+                        progress_bar.progress(current_item / total_items)
+
+                    # 2. S3 & Route53: independent of each other, so delete them in parallel
+                    with ThreadPoolExecutor(max_workers=NUKE_WORKERS) as ex:
+                        futures = {}
+                        for resource in all_resources:
+                            if "S3" in resource['Type']:
+                                futures[ex.submit(delete_bucket_fully, resource['Name'])] = resource
+                            elif "Route53" in resource['Type']:
+                                futures[ex.submit(delete_zone_fully, resource['ID'])] = resource
+
+                        # UI updates stay on the main thread (Streamlit calls are not thread-safe)
+                        for future in as_completed(futures):
+                            resource = futures[future]
+                            current_item += 1
                             try:
-                                # 1. List all records
-                                records = r53_client.list_resource_record_sets(HostedZoneId=r_id)['ResourceRecordSets']
-
-                                # 2. Delete all non-default records (A, CNAME, etc.)
-                                for rec in records:
-                                    # Skip default records (SOA and NS) - AWS manages these
-                                    if rec['Type'] in ['SOA', 'NS']:
-                                        continue
-
-                                    # Delete custom record
-                                    r53_client.change_resource_record_sets(
-                                        HostedZoneId=r_id,
-                                        ChangeBatch={
-                                            'Changes': [{
-                                                'Action': 'DELETE',
-                                                'ResourceRecordSet': rec
-                                            }]
-                                        }
-                                    )
+                                future.result()
+                            except Exception as e:
+                                failures += 1
+                                st.error(f"Error cleaning {resource['Type']} {resource['Name']}: {e}")
 
-                                # 3. Now delete the Zone (it should be empty of custom records)
-                                r53_client.delete_hosted_zone(Id=r_id)
+                            if current_item % update_every == 0 or current_item == total_items:
+                                progress_bar.progress(current_item / total_items)
+                                status_text.text(f"Deleted {current_item}/{total_items} resources...")
 
-                            except Exception as e:
-                                st.error(f"Error cleaning Zone {r_name}: {e}")
+                    # Some resources are gone either way - the next run must rescan
+                    clear_inventory_caches()
 
-                    status_text.success("✅ System Nuked Successfully!")
-                    time.sleep(2)
-                    st.session_state['confirm_nuke'] = False
-                    st.rerun()
+                    if failures:
+                        # Keep the errors on screen (a rerun would wipe them) and leave the confirmation open to retry
+                        st.warning(f"⚠️ Nuke finished with {failures} failure(s) - see the errors above.")
+                    else:
+                        st.toast("✅ System Nuked Successfully!")
+                        st.session_state['confirm_nuke'] = False
+                        st.rerun(scope="fragment")
 
                 except Exception as e:
                     st.error(f"Error during nuke: {e}")
@@ -255,39 +538,15 @@ if menu == "🏠 Dashboard":
 # ==========================================
 #            STEP 2: EC2 MANAGER
 # ==========================================
-elif menu == "🖥️ EC2 Instances":
+@st.fragment
+def ec2_page():
+    """Launch, list and control EC2 instances."""
     st.header("🖥️ EC2 Instance Manager")
 
     # --- 1. Fetch Instances FIRST (Inventory Check) ---
     try:
-        response = ec2_client.describe_instances(
-            Filters=[{'Name': f'tag:{TAG_KEY}', 'Values': [TAG_VALUE]}]
-        )
-
-        instances = []
-        active_count = 0
-
-        for r in response['Reservations']:
-            for i in r['Instances']:
-                state = i['State']['Name']
-                if state != "terminated":
-                    active_count += 1
-
-                name = "Unknown"
-                if 'Tags' in i:
-                    for t in i['Tags']:
-                        if t['Key'] == 'Name':
-                            name = t['Value']
-                            break
-
-                instances.append({
-                    "id": i['InstanceId'],
-                    "name": name,
-                    "state": state,
-                    "ip": i.get('PublicIpAddress', 'N/A'),
-                    "type": i['InstanceType']
-                })
-
+        instances = apply_expected_states(list_managed_instances())
+        active_count = len(instances)
     except Exception as e:
         st.error(f"Error loading instances: {e}")
         instances = []
@@ -304,7 +563,7 @@ elif menu == "🖥️ EC2 Instances":
                 new_name = st.text_input("Instance Name", placeholder="web-server-1")
 
             with col2:
-                os_type = st.selectbox("Operating System", ["Amazon Linux 2023", "Ubuntu 24.04 LTS"])
+                os_type = st.selectbox("Operating System", list(AMI_SSM_PARAMS))
 
             with col3:
                 inst_type = st.selectbox("Instance Type", ["t3.micro", "t2.small"])
@@ -314,31 +573,9 @@ elif menu == "🖥️ EC2 Instances":
                     st.error("⚠️ Please enter a name for the instance.")
                 else:
                     try:
-                        # --- THE UPGRADE: Dynamic AMI Fetching ---
-                        ami_id = None
+                        # --- THE UPGRADE: Dynamic AMI Fetching (cached for an hour) ---
                         with st.spinner(f"🔍 Fetching latest secure AMI for {os_type}..."):
-
-                            if "Amazon Linux" in os_type:
-                                # Method 1: Get latest from SSM Parameter Store (Best Practice)
-                                param = ssm_client.get_parameter(
-                                    Name='/aws/service/ami-amazon-linux-latest/al2023-ami-kernel-default-x86_64'
-                                )
-                                ami_id = param['Parameter']['Value']
-
-                            elif "Ubuntu" in os_type:
-                                # Method 2: Search for latest image from Canonical
-                                images = ec2_client.describe_images(
-                                    Owners=['099720109477'],  # Canonical Owner ID
-                                    Filters=[
-                                        {'Name': 'name',
-                                         'Values': ['ubuntu/images/hvm-ssd-gp3/ubuntu-noble-24.04-amd64-server-*']},
-                                        {'Name': 'architecture', 'Values': ['x86_64']},
-                                        {'Name': 'state', 'Values': ['available']}
-                                    ]
-                                )
-                                # Sort by creation date (Newest first)
-                                sorted_imgs = sorted(images['Images'], key=lambda x: x['CreationDate'], reverse=True)
-                                ami_id = sorted_imgs[0]['ImageId']
+                            ami_id = get_latest_ami(os_type)
 
                         # --- Launch ---
                         with st.spinner(f"🚀 Launching {new_name} using {ami_id}..."):
@@ -355,9 +592,9 @@ elif menu == "🖥️ EC2 Instances":
                                     ]
                                 }]
                             )
-                            st.success(f"✅ Instance '{new_name}' launched using latest AMI!")
-                            time.sleep(2)
-                            st.rerun()
+                            list_managed_instances.clear()
+                            st.toast(f"✅ Instance '{new_name}' launched using latest AMI!")
+                            st.rerun(scope="fragment")
 
                     except Exception as e:
                         st.error(f"❌ Error: {e}")
@@ -370,51 +607,138 @@ elif menu == "🖥️ EC2 Instances":
     if not instances:
         st.info("ℹ️ No managed instances found.")
     else:
-        for inst in instances:
-            if inst['state'] == "terminated": continue
+        # One table widget for all rows (instead of a row of widgets per instance)
+        st.dataframe(
+            [{
+                "Name": inst['name'],
+                "Instance ID": inst['id'],
+                "State": f"{STATE_ICONS.get(inst['state'], '🟡')} {inst['state'].upper()}",
+                "Type": inst['type'],
+                "Public IP": inst['ip']
+            } for inst in instances],
+            use_container_width=True,
+            hide_index=True
+        )
+
+        # --- Bulk actions: one API call for all selected instances ---
+        by_id = {inst['id']: inst for inst in instances}
+        c1, c2, c3, c4 = st.columns([4, 1, 1, 1])
+
+        selected_ids = c1.multiselect(
+            "Act on:",
+            list(by_id),
+            format_func=lambda i: f"{by_id[i]['name']} ({i})"
+        )
+        to_stop = [i for i in selected_ids if by_id[i]['state'] == 'running']
+        to_start = [i for i in selected_ids if by_id[i]['state'] == 'stopped']
+
+        c2.write("")
+        c3.write("")
+        c4.write("")
+
+        if c2.button("Stop", disabled=not to_stop):
+            ec2_client.stop_instances(InstanceIds=to_stop)
+            set_expected_state(to_stop, 'stopping')
+            st.toast(f"🛑 Stopping {len(to_stop)} instance(s)...")
+            st.rerun(scope="fragment")
+
+        if c3.button("Start", disabled=not to_start):
+            ec2_client.start_instances(InstanceIds=to_start)
+            set_expected_state(to_start, 'pending')
+            st.toast(f"🟢 Starting {len(to_start)} instance(s)...")
+            st.rerun(scope="fragment")
+
+        if c4.button("Terminate", disabled=not selected_ids):
+            ec2_client.terminate_instances(InstanceIds=selected_ids)
+            set_expected_state(selected_ids, 'shutting-down')
+            st.toast(f"🗑️ Terminating {len(selected_ids)} instance(s)...")
+            st.rerun(scope="fragment")
 
-            if inst['state'] == "running":
-                status_color = "🟢"
-            elif inst['state'] == "stopped":
-                status_color = "🔴"
-            else:
-                status_color = "🟡"
-
-            c1, c2, c3, c4, c5, c6 = st.columns([2, 2, 1.5, 1.5, 2, 2])
-
-            c1.write(f"**{inst['name']}**")
-            c2.caption(f"`{inst['id']}`")
-            c3.write(f"{status_color} {inst['state'].upper()}")
-            c4.caption(inst['type'])
-            c5.code(inst['ip'])
-
-            with c6:
-                if inst['state'] == 'running':
-                    if st.button("Stop", key=f"stop_{inst['id']}"):
-                        ec2_client.stop_instances(InstanceIds=[inst['id']])
-                        st.toast(f"🛑 Stopping {inst['name']}...")
-                        time.sleep(1)
-                        st.rerun()
-
-                elif inst['state'] == 'stopped':
-                    if st.button("Start", key=f"start_{inst['id']}"):
-                        ec2_client.start_instances(InstanceIds=[inst['id']])
-                        st.toast(f"🟢 Starting {inst['name']}...")
-                        time.sleep(1)
-                        st.rerun()
-
-                if st.button("Terminate", key=f"term_{inst['id']}"):
-                    ec2_client.terminate_instances(InstanceIds=[inst['id']])
-                    st.toast(f"🗑️ Terminating {inst['name']}...")
-                    time.sleep(1)
-                    st.rerun()
-
-            st.markdown("---")
 
 # ==========================================
 #            STEP 3: S3 MANAGER
 # ==========================================
-elif menu == "📦 S3 Buckets":
+def upload_with_progress(uploaded_file, bucket_name):
+    """
+    Multipart upload with a live progress bar.
+    s3transfer reports progress from its own threads, so the upload runs in the
+    background while this (script) thread polls the byte count and draws the bar.
+    """
+    progress_bar = st.progress(0.0, text=f"Uploading {uploaded_file.name}...")
+    sent = [0]
+    sent_lock = threading.Lock()  # parts finish on several transfer threads at once
+
+    def on_chunk(bytes_sent):
+        with sent_lock:
+            sent[0] += bytes_sent
+
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        upload = ex.submit(s3_client.upload_fileobj, uploaded_file, bucket_name, uploaded_file.name,
+                           Config=UPLOAD_CONFIG, Callback=on_chunk)
+        while not upload.done():
+            progress_bar.progress(min(sent[0] / uploaded_file.size, 1.0),
+                                  text=f"Uploading {uploaded_file.name}...")
+            time.sleep(0.2)
+        upload.result()
+
+    progress_bar.progress(1.0, text="Upload complete")
+
+
+@st.fragment
+def bucket_files_panel(bucket_name):
+    """Upload form and file list for one bucket (reruns on its own)."""
+    # --- UPLOAD SECTION (Auto-Clear) ---
+    # Initialize session state for uploader key if not exists
+    if f"uploader_key_{bucket_name}" not in st.session_state:
+        st.session_state[f"uploader_key_{bucket_name}"] = 0
+
+    # Dynamic key allows us to reset the widget
+    dynamic_key = f"up_{bucket_name}_{st.session_state[f'uploader_key_{bucket_name}']}"
+
+    uploaded_file = st.file_uploader("Upload File", key=dynamic_key)
+
+    if uploaded_file is not None:
+        if st.button("Start Upload", key=f"btn_up_{bucket_name}"):
+            try:
+                if uploaded_file.size < MULTIPART_THRESHOLD:
+                    with st.spinner("Uploading..."):
+                        s3_client.put_object(Bucket=bucket_name, Key=uploaded_file.name,
+                                             Body=uploaded_file.getvalue())
+                else:
+                    upload_with_progress(uploaded_file, bucket_name)
+                st.toast(f"✅ '{uploaded_file.name}' uploaded!")
+
+                # Increment key to reset uploader on next run
+                st.session_state[f"uploader_key_{bucket_name}"] += 1
+                st.rerun(scope="fragment")
+            except Exception as e:
+                st.error(f"Upload failed: {e}")
+
+    st.markdown("---")
+
+    # --- FILE LIST ---
+    st.caption("Current Files:")
+    try:
+        # Paginate - a single call stops at 1000 keys
+        pages = s3_client.get_paginator('list_objects_v2').paginate(Bucket=bucket_name)
+        files = [{
+            "File": obj['Key'],
+            "Size (KB)": round(obj['Size'] / 1024, 2),
+            "Modified": obj['LastModified']
+        } for obj in pages.search('Contents[]')]
+
+        if files:
+            # One table widget instead of one text element per file
+            st.dataframe(files, use_container_width=True, hide_index=True)
+        else:
+            st.info("Bucket is empty.")
+    except Exception as e:
+        st.error(f"Could not list files: {e}")
+
+
+@st.fragment
+def s3_page():
+    """Create buckets, upload files and delete buckets."""
     st.header("📦 S3 Bucket Manager")
 
     # --- 1. Create New Bucket Form ---
@@ -470,7 +794,9 @@ elif menu == "📦 S3 Buckets":
                                 }]
                             }
                             s3_client.put_bucket_policy(Bucket=b_name, Policy=json.dumps(bucket_policy))
-                            st.success(f"✅ Public Bucket '{b_name}' created!")
+                            get_managed_bucket_names.clear()
+                            get_public_access.clear()
+                            st.toast(f"✅ Public Bucket '{b_name}' created!")
                         else:
                             s3_client.put_public_access_block(
                                 Bucket=b_name,
@@ -479,10 +805,11 @@ elif menu == "📦 S3 Buckets":
                                     'BlockPublicPolicy': True, 'RestrictPublicBuckets': True
                                 }
                             )
-                            st.success(f"✅ Private Bucket '{b_name}' created!")
+                            get_managed_bucket_names.clear()
+                            get_public_access.clear()
+                            st.toast(f"✅ Private Bucket '{b_name}' created!")
 
-                        time.sleep(1)
-                        st.rerun()
+                        st.rerun(scope="fragment")
 
                 except Exception as e:
                     st.error(f"❌ Error: {e}")
@@ -494,54 +821,48 @@ elif menu == "📦 S3 Buckets":
 
     with st.spinner("Scanning buckets..."):
         try:
-            response = s3_client.list_buckets()
-            managed_buckets = []
-
-            # Filter Buckets
-            for b in response['Buckets']:
-                try:
-                    tags = s3_client.get_bucket_tagging(Bucket=b['Name'])
-                    for t in tags['TagSet']:
-                        if t['Key'] == TAG_KEY and t['Value'] == TAG_VALUE:
-                            managed_buckets.append(b['Name'])
-                            break
-                except Exception:
-                    continue
+            managed_buckets = get_managed_bucket_names()
 
             if not managed_buckets:
                 st.info("ℹ️ No managed buckets found.")
             else:
+                # Status Check - fetch every bucket's public access block in parallel
+                # (workers need the script context to read/write the cache)
+                ctx = get_script_run_ctx()
+                with ThreadPoolExecutor(max_workers=SCAN_WORKERS, initializer=add_script_run_ctx,
+                                        initargs=(None, ctx)) as ex:
+                    access = dict(zip(managed_buckets, ex.map(get_public_access, managed_buckets)))
+
                 for bucket_name in managed_buckets:
                     # Layout
                     c1, c2, c3 = st.columns([3, 2, 1.5])
 
                     c1.write(f"📦 **{bucket_name}**")
 
-                    # Status Check
-                    try:
-                        pab = s3_client.get_public_access_block(Bucket=bucket_name)
-                        is_secure = pab['PublicAccessBlockConfiguration']['BlockPublicPolicy']
-                        status_text = "🔒 Private" if is_secure else "🌍 Public"
-                        status_color = "green" if is_secure else "red"
-                    except:
+                    is_secure = access[bucket_name]
+                    if is_secure is None:
                         status_text = "🌍 Public (No Block)"
                         status_color = "red"
+                    else:
+                        status_text = "🔒 Private" if is_secure else "🌍 Public"
+                        status_color = "green" if is_secure else "red"
 
                     c2.markdown(f":{status_color}[{status_text}]")
 
                     # --- SAFE DELETE LOGIC ---
                     # 1. The main delete button
                     if c3.button("Delete", key=f"pre_del_{bucket_name}"):
-                        # Check contents first
-                        objs = s3_client.list_objects_v2(Bucket=bucket_name)
-                        file_count = len(objs.get('Contents', []))
+                        # Check contents first - one key is enough to know (old versions count too)
+                        peek = s3_client.list_object_versions(Bucket=bucket_name, MaxKeys=1)
+                        is_empty = not (peek.get('Versions') or peek.get('DeleteMarkers'))
 
-                        if file_count == 0:
+                        if is_empty:
                             # Empty? Delete immediately
                             s3_client.delete_bucket(Bucket=bucket_name)
+                            wait_until_bucket_gone(bucket_name)
+                            get_managed_bucket_names.clear()
                             st.toast(f"🗑️ Deleted {bucket_name}")
-                            time.sleep(1)
-                            st.rerun()
+                            st.rerun(scope="fragment")
                         else:
                             # Not empty? Trigger confirmation mode
                             st.session_state[f"confirm_delete_{bucket_name}"] = True
@@ -554,77 +875,26 @@ elif menu == "📦 S3 Buckets":
                         if col_confirm.button("Yes, Delete Everything", key=f"force_del_{bucket_name}"):
                             try:
                                 with st.spinner(f"Nuking {bucket_name}..."):
-                                    # Recursive Delete
-                                    objects = s3_client.list_objects_v2(Bucket=bucket_name)
-                                    if 'Contents' in objects:
-                                        for obj in objects['Contents']:
-                                            s3_client.delete_object(Bucket=bucket_name, Key=obj['Key'])
-
-                                    # Versions
-                                    versions = s3_client.list_object_versions(Bucket=bucket_name)
-                                    if 'Versions' in versions:
-                                        for v in versions['Versions']:
-                                            s3_client.delete_object(Bucket=bucket_name, Key=v['Key'],
-                                                                    VersionId=v['VersionId'])
-                                    if 'DeleteMarkers' in versions:
-                                        for dm in versions['DeleteMarkers']:
-                                            s3_client.delete_object(Bucket=bucket_name, Key=dm['Key'],
-                                                                    VersionId=dm['VersionId'])
+                                    # Recursive Delete (objects, versions & markers)
+                                    empty_bucket(bucket_name)
 
                                     s3_client.delete_bucket(Bucket=bucket_name)
-                                    st.success(f"🗑️ Deleted {bucket_name}")
+                                    wait_until_bucket_gone(bucket_name)
+                                    get_managed_bucket_names.clear()
+                                    st.toast(f"🗑️ Deleted {bucket_name}")
                                     # Clear state
                                     del st.session_state[f"confirm_delete_{bucket_name}"]
-                                    time.sleep(1)
-                                    st.rerun()
+                                    st.rerun(scope="fragment")
                             except Exception as e:
                                 st.error(f"Error: {e}")
 
                         if col_cancel.button("Cancel", key=f"cancel_{bucket_name}"):
                             del st.session_state[f"confirm_delete_{bucket_name}"]
-                            st.rerun()
+                            st.rerun(scope="fragment")
 
                     # --- EXPANDER: Upload & File List ---
                     with st.expander(f"📂 Manage Files in '{bucket_name}'"):
-
-                        # --- UPLOAD SECTION (Auto-Clear) ---
-                        # Initialize session state for uploader key if not exists
-                        if f"uploader_key_{bucket_name}" not in st.session_state:
-                            st.session_state[f"uploader_key_{bucket_name}"] = 0
-
-                        # Dynamic key allows us to reset the widget
-                        dynamic_key = f"up_{bucket_name}_{st.session_state[f'uploader_key_{bucket_name}']}"
-
-                        uploaded_file = st.file_uploader("Upload File", key=dynamic_key)
-
-                        if uploaded_file is not None:
-                            if st.button("Start Upload", key=f"btn_up_{bucket_name}"):
-                                try:
-                                    with st.spinner("Uploading..."):
-                                        s3_client.upload_fileobj(uploaded_file, bucket_name, uploaded_file.name)
-                                        st.success(f"✅ '{uploaded_file.name}' uploaded!")
-
-                                        # Increment key to reset uploader on next run
-                                        st.session_state[f"uploader_key_{bucket_name}"] += 1
-                                        time.sleep(1)
-                                        st.rerun()
-                                except Exception as e:
-                                    st.error(f"Upload failed: {e}")
-
-                        st.markdown("---")
-
-                        # --- FILE LIST ---
-                        st.caption("Current Files:")
-                        try:
-                            objs = s3_client.list_objects_v2(Bucket=bucket_name)
-                            if 'Contents' in objs:
-                                for obj in objs['Contents']:
-                                    size_kb = round(obj['Size'] / 1024, 2)
-                                    st.text(f"📄 {obj['Key']}  ({size_kb} KB)")
-                            else:
-                                st.info("Bucket is empty.")
-                        except Exception as e:
-                            st.error(f"Could not list files: {e}")
+                        bucket_files_panel(bucket_name)
 
                     st.markdown("---")
 
@@ -634,7 +904,9 @@ elif menu == "📦 S3 Buckets":
 # ==========================================
 #            STEP 4: ROUTE53 MANAGER
 # ==========================================
-elif menu == "🌐 Route53 Zones":
+@st.fragment
+def route53_page():
+    """Manage Hosted Zones and their DNS records."""
     st.header("🌐 Route53 DNS Manager")
 
     # --- 1. Create Zone Form ---
@@ -662,9 +934,9 @@ elif menu == "🌐 Route53 Zones":
                         ResourceId=zone_id,
                         AddTags=[{'Key': TAG_KEY, 'Value': TAG_VALUE}]
                     )
-                    st.success(f"✅ Zone '{domain}' created successfully!")
-                    time.sleep(1)
-                    st.rerun()
+                    get_managed_zones.clear()
+                    st.toast(f"✅ Zone '{domain}' created successfully!")
+                    st.rerun(scope="fragment")
                 except Exception as e:
                     st.error(f"Error: {e}")
 
@@ -675,30 +947,14 @@ elif menu == "🌐 Route53 Zones":
 
     with st.spinner("Filtering zones..."):
         try:
-            all_zones = r53_client.list_hosted_zones()['HostedZones']
-            managed_zones = []
-
-            # Filter
-            for z in all_zones:
-                try:
-                    z_id = z['Id'].split('/')[-1]
-                    tags_response = r53_client.list_tags_for_resource(ResourceType='hostedzone', ResourceId=z_id)
-                    tag_list = tags_response['ResourceTagSet']['Tags']
-
-                    for t in tag_list:
-                        if t['Key'] == TAG_KEY and t['Value'] == TAG_VALUE:
-                            managed_zones.append(z)
-                            break
-                except Exception:
-                    continue
-
+            managed_zones = get_managed_zones()
 
             if not managed_zones:
                 st.info("ℹ️ No managed zones found.")
             else:
                 for z in managed_zones:
-                    z_id = z['Id'].split('/')[-1]
-                    z_name = z['Name']
+                    z_id = z['id']
+                    z_name = z['name']
 
                     c1, c2, c3 = st.columns([3, 2, 1])
                     c1.write(f"🌐 **{z_name}**")
@@ -707,9 +963,9 @@ elif menu == "🌐 Route53 Zones":
                     if c3.button("Delete Zone", key=f"del_zone_{z_id}"):
                         try:
                             r53_client.delete_hosted_zone(Id=z_id)
-                            st.success("Zone deleted!")
-                            time.sleep(1)
-                            st.rerun()
+                            get_managed_zones.clear()
+                            st.toast("Zone deleted!")
+                            st.rerun(scope="fragment")
                         except Exception as e:
                             st.error("❌ Zone must be empty of custom records before deleting.")
 
@@ -751,13 +1007,13 @@ elif menu == "🌐 Route53 Zones":
                                             }]
                                         }
                                     )
-                                    st.success(f"✅ Record added!")
+                                    list_zone_records.clear(z_id)
+                                    st.toast("✅ Record added!")
 
                                     # 2. Increment counter to clear the form
                                     st.session_state[f"form_counter_{z_id}"] += 1
 
-                                    time.sleep(1)
-                                    st.rerun()
+                                    st.rerun(scope="fragment")
                                 except Exception as e:
                                     st.error(f"Error: {e}")
 
@@ -766,38 +1022,55 @@ elif menu == "🌐 Route53 Zones":
                         # B. List Existing Records
                         st.caption("Current DNS Records:")
                         try:
-                            records = r53_client.list_resource_record_sets(HostedZoneId=z_id)['ResourceRecordSets']
-
-                            for rec in records:
-                                rec_name = rec['Name']
-                                rec_type = rec['Type']
-                                rec_values = [r['Value'] for r in rec.get('ResourceRecords', [])]
-                                value_str = ", ".join(rec_values)
-
-                                r_col1, r_col2, r_col3, r_col4 = st.columns([3, 1, 3, 1])
-                                r_col1.write(f"`{rec_name}`")
-                                r_col2.write(f"**{rec_type}**")
-                                r_col3.write(value_str)
-
-                                if rec_type not in ['SOA', 'NS']:
-                                    if r_col4.button("🗑️", key=f"del_rec_{rec_name}_{z_id}"):
-                                        try:
-                                            r53_client.change_resource_record_sets(
-                                                HostedZoneId=z_id,
-                                                ChangeBatch={
-                                                    'Changes': [{
-                                                        'Action': 'DELETE',
-                                                        'ResourceRecordSet': rec
-                                                    }]
-                                                }
-                                            )
-                                            st.toast(f"Deleted {rec_name}")
-                                            time.sleep(1)
-                                            st.rerun()
-                                        except Exception as e:
-                                            st.error(f"Error: {e}")
-                                else:
-                                    r_col4.write("🔒")
+                            records = list_zone_records(z_id)
+
+                            # SOA/NS are managed by AWS - keep them out of the editable list
+                            infra_records = [r for r in records if r['Type'] in ['SOA', 'NS']]
+                            custom_records = [r for r in records if r['Type'] not in ['SOA', 'NS']]
+
+                            if not custom_records:
+                                st.info("No custom records yet.")
+                            else:
+                                st.dataframe(
+                                    [{
+                                        "Name": rec['Name'],
+                                        "Type": rec['Type'],
+                                        "Value": ", ".join(r['Value'] for r in rec.get('ResourceRecords', []))
+                                    } for rec in custom_records],
+                                    use_container_width=True,
+                                    hide_index=True
+                                )
+
+                                # Bulk delete: every selected record goes out in a single ChangeBatch
+                                by_label = {f"{rec['Name']} ({rec['Type']})": rec for rec in custom_records}
+                                d_col1, d_col2 = st.columns([4, 1])
+                                to_delete = d_col1.multiselect("Select records:", list(by_label), key=f"sel_rec_{z_id}")
+                                d_col2.write("")
+                                d_col2.write("")
+
+                                if d_col2.button("🗑️ Delete", key=f"del_rec_{z_id}", disabled=not to_delete):
+                                    try:
+                                        r53_client.change_resource_record_sets(
+                                            HostedZoneId=z_id,
+                                            ChangeBatch={
+                                                'Changes': [{
+                                                    'Action': 'DELETE',
+                                                    'ResourceRecordSet': by_label[label]
+                                                } for label in to_delete]
+                                            }
+                                        )
+                                        list_zone_records.clear(z_id)
+                                        st.session_state.pop(f"sel_rec_{z_id}", None)
+                                        st.toast(f"Deleted {len(to_delete)} record(s)")
+                                        st.rerun(scope="fragment")
+                                    except Exception as e:
+                                        st.error(f"Error: {e}")
+
+                            # Read-only records are only drawn on demand
+                            if st.toggle("🔒 Show zone infrastructure records (SOA/NS)", key=f"infra_{z_id}"):
+                                for rec in infra_records:
+                                    values = ", ".join(r['Value'] for r in rec.get('ResourceRecords', []))
+                                    st.text(f"{rec['Name']}  {rec['Type']}  {values}")
 
                         except Exception as e:
                             st.error(f"Could not load records: {e}")
@@ -805,4 +1078,18 @@ elif menu == "🌐 Route53 Zones":
                     st.markdown("---")
 
         except Exception as e:
-            st.error(f"Error loading zones: {e}")
\ No newline at end of file
+            st.error(f"Error loading zones: {e}")
+
+
+# ==========================================
+#            PAGE ROUTING
+# ==========================================
+# Each page is a fragment: clicks inside a page only rerun that page
+if menu == "🏠 Dashboard":
+    dashboard_page()
+elif menu == "🖥️ EC2 Instances":
+    ec2_page()
+elif menu == "📦 S3 Buckets":
+    s3_page()
+elif menu == "🌐 Route53 Zones":
+    route53_page()
@@ -1,41 +1,59 @@
 import click
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import ec2 as ec2_ops
 import s3 as s3_ops
 import route53 as r53_ops
 
+# Styled EC2 states for the status listing, built once instead of once per row
+STATE_STYLES = {
+    state: click.style(state, fg="green" if state == 'running' else "yellow")
+    for state in ['pending', 'running', 'stopping', 'stopped', 'shutting-down']
+}
+
+
+def scan_managed_resources():
+    """
+    Finds every EC2 instance, S3 bucket and Route53 zone created by this CLI.
+    The three services are independent, so they are scanned at the same time.
+    """
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        f_instances = executor.submit(ec2_ops.list_instances, print_table=False)
+        f_buckets = executor.submit(s3_ops.get_managed_buckets)
+        f_zones = executor.submit(r53_ops.get_managed_zones)
+        return f_instances.result(), f_buckets.result(), f_zones.result()
+
+
 def execute_cleanup(yes):
     """
     The actual logic for finding and deleting resources.
     Moved here to keep main.py clean.
     """
-    click.echo(click.style("Scanning for resources to delete...", fg="cyan"))
+    click.secho("Scanning for resources to delete...", fg="cyan")
 
     # 1. Discovery Phase (Find everything)
-    instances = ec2_ops.list_instances(print_table=False)
-    buckets = s3_ops.get_managed_buckets()
-    zones = r53_ops.get_managed_zones()
+    instances, buckets, zones = scan_managed_resources()
 
     total_count = len(instances) + len(buckets) + len(zones)
 
     if total_count == 0:
-        click.echo(click.style("No resources found. Environment is clean! ✨", fg="green"))
+        click.secho("No resources found. Environment is clean! ✨", fg="green")
         return
 
     # 2. Preview Phase (Show the list)
-    click.echo(click.style(f"\nFound {total_count} resources managed by platform-cli:", fg="yellow", bold=True))
+    click.secho(f"\nFound {total_count} resources managed by platform-cli:", fg="yellow", bold=True)
 
     if instances:
-        click.echo(click.style(f"\n[EC2 Instances] ({len(instances)})", bold=True))
+        click.secho(f"\n[EC2 Instances] ({len(instances)})", bold=True)
         for i in instances:
             click.echo(f" - {i['id']} ({i['name']})")
 
     if buckets:
-        click.echo(click.style(f"\n[S3 Buckets] ({len(buckets)})", bold=True))
+        click.secho(f"\n[S3 Buckets] ({len(buckets)})", bold=True)
         for b in buckets:
             click.echo(f" - {b}")
 
     if zones:
-        click.echo(click.style(f"\n[Route53 Zones] ({len(zones)})", bold=True))
+        click.secho(f"\n[Route53 Zones] ({len(zones)})", bold=True)
         for z in zones:
             click.echo(f" - {z['name']} ({z['id']})")
 
@@ -48,41 +66,54 @@ def execute_cleanup(yes):
             return
 
     # 4. Execution Phase (Delete everything)
-    click.echo(click.style("\n--- Starting Cleanup ---", fg="white", bold=True))
+    click.secho("\n--- Starting Cleanup ---", fg="white", bold=True)
 
+    # The three deletions don't depend on each other - run them in parallel,
+    # reusing what we just found instead of scanning the account again.
+    # Each phase writes into its own buffer so the output reads phase by phase.
+    phases = []
     if instances:
-        ec2_ops.terminate_all_instances()
-
+        phases.append(("EC2 Instances", ec2_ops.terminate_all_instances, instances))
     if buckets:
-        s3_ops.delete_all_buckets()
-
+        phases.append(("S3 Buckets", s3_ops.delete_all_buckets, buckets))
     if zones:
-        r53_ops.delete_all_zones()
+        phases.append(("Route53 Zones", r53_ops.delete_all_zones, zones))
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {}
+        for title, delete_all, resources in phases:
+            lines = []
+            futures[executor.submit(delete_all, resources, lines.append)] = (title, lines)
+
+        # Print each phase as soon as it finishes, surfacing any unexpected failure
+        for future in as_completed(futures):
+            title, lines = futures[future]
+            click.secho(f"\n[{title}]", bold=True)
+            for line in lines:
+                click.echo(line)
+            future.result()
 
-    click.echo(click.style("\nCleanup complete! 🧹", fg="green", bold=True))
+    click.secho("\nCleanup complete! 🧹", fg="green", bold=True)
 
 
 def show_inventory():
     """
     Scans and displays ALL resources currently managed by this CLI.
     """
-    click.echo(click.style("\n📊  Project Status Dashboard", fg="cyan", bold=True))
-    click.echo(click.style("==========================", fg="cyan"))
+    click.secho("\n📊  Project Status Dashboard", fg="cyan", bold=True)
+    click.secho("==========================", fg="cyan")
     click.echo("Scanning AWS resources...\n")
 
     # 1. Scan Everything
-    instances = ec2_ops.list_instances(print_table=False)
-    buckets = s3_ops.get_managed_buckets()
-    zones = r53_ops.get_managed_zones()
+    instances, buckets, zones = scan_managed_resources()
 
     total_count = len(instances) + len(buckets) + len(zones)
 
     # 2. Display EC2
     if instances:
-        click.echo(click.style(f"🖥️   EC2 Instances ({len(instances)})", fg="green", bold=True))
+        click.secho(f"🖥️   EC2 Instances ({len(instances)})", fg="green", bold=True)
         for i in instances:
-            state_color = "green" if i['state'] == 'running' else "yellow"
-            state_text = click.style(i['state'], fg=state_color)
+            state_text = STATE_STYLES.get(i['state']) or click.style(i['state'], fg="yellow")
 
             # Safe get for IP
             public_ip = i.get('ip', 'No Public IP')
@@ -90,34 +121,34 @@ def show_inventory():
             click.echo(f"  • {i['name']} ({i['id']}) - [{state_text}] - {public_ip}")
     else:
         # TIKUN: dim=True instead of fg="dim"
-        click.echo(click.style("🖥️   EC2 Instances: None", dim=True))
+        click.secho("🖥️   EC2 Instances: None", dim=True)
 
     click.echo("")  # Spacer
 
     # 3. Display S3
     if buckets:
-        click.echo(click.style(f"📦  S3 Buckets ({len(buckets)})", fg="yellow", bold=True))
+        click.secho(f"📦  S3 Buckets ({len(buckets)})", fg="yellow", bold=True)
         for b in buckets:
             click.echo(f"  • {b}")
     else:
         # TIKUN: dim=True instead of fg="dim"
-        click.echo(click.style("📦  S3 Buckets: None", dim=True))
+        click.secho("📦  S3 Buckets: None", dim=True)
 
     click.echo("")  # Spacer
 
     # 4. Display Route53
     if zones:
-        click.echo(click.style(f"🌐  Route53 Zones ({len(zones)})", fg="blue", bold=True))
+        click.secho(f"🌐  Route53 Zones ({len(zones)})", fg="blue", bold=True)
         for z in zones:
             click.echo(f"  • {z['name']} ({z['id']})")
     else:
         # TIKUN: dim=True instead of fg="dim"
-        click.echo(click.style("🌐  Route53 Zones: None", dim=True))
+        click.secho("🌐  Route53 Zones: None", dim=True)
 
     # 5. Summary
-    click.echo(click.style("--------------------------", fg="cyan"))
+    click.secho("--------------------------", fg="cyan")
     if total_count > 0:
-        click.echo(click.style(f"✅ Total Managed Resources: {total_count}", bold=True))
+        click.secho(f"✅ Total Managed Resources: {total_count}", bold=True)
     else:
-        click.echo(click.style("✨ Environment is clean (0 resources).", fg="green"))
+        click.secho("✨ Environment is clean (0 resources).", fg="green")
     click.echo("")
\ No newline at end of file
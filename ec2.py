@@ -1,55 +1,99 @@
 import click
-from utils import get_boto3_resource, get_boto3_client, get_common_tags, TAG_KEY, TAG_VALUE
-from rich.console import Console
-from rich.table import Table
+import functools
+import itertools
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from utils import get_boto3_resource, get_boto3_client, get_common_tags, get_console, make_table, tags_to_dict, TAG_KEY, TAG_VALUE
 
 ec2 = get_boto3_resource('ec2')
 ssm_client = get_boto3_client('ssm')
+ec2_client = get_boto3_client('ec2')
 
-def get_latest_ami(os_type):
+# EC2 accepts up to 1000 instance IDs per start/stop/terminate call
+EC2_BATCH_SIZE = 1000
+
+# SSM answers are kept on disk so repeat CLI runs skip the lookup entirely.
+# Format: {'<region>:<param_path>': {'value': ami_id, 'expires': iso_timestamp}}
+# AMI IDs are regional, so the region is part of the key.
+SSM_CACHE_FILE = Path.home() / '.cache' / 'platform-cli' / 'ssm.json'
+SSM_CACHE_TTL = timedelta(hours=1)
+
+def _load_ssm_cache():
+    """Reads the on-disk SSM cache. A missing or broken file is just an empty cache."""
+    try:
+        return json.loads(SSM_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def _save_ssm_cache(cache):
+    """Writes the SSM cache back to disk. Failing to write only costs us the cache."""
+    try:
+        SSM_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        SSM_CACHE_FILE.write_text(json.dumps(cache))
+    except OSError:
+        pass
+
+def clear_ssm_cache():
+    """Deletes the on-disk SSM cache file."""
+    try:
+        SSM_CACHE_FILE.unlink()
+        click.echo(click.style(f"Removed {SSM_CACHE_FILE}", fg="green"))
+    except FileNotFoundError:
+        click.echo("No cache to remove.")
+
+def get_latest_ami(os_type, refresh=False):
     """
     Fetches the latest AMI ID using SSM Parameter Store for BOTH OS types.
     This ensures we always get the latest official stable release.
+    Answers are cached on disk for an hour; pass refresh=True to force a lookup.
     """
     if os_type == "ubuntu":
         param_path = '/aws/service/canonical/ubuntu/server/22.04/stable/current/amd64/hvm/ebs-gp2/ami-id'
     else:
         param_path = '/aws/service/ami-amazon-linux-latest/al2023-ami-kernel-default-x86_64'
 
+    # AMIs are published at most daily - reuse a recent answer
+    now = datetime.now(timezone.utc)
+    cache_key = f"{ssm_client.meta.region_name}:{param_path}"
+    cache = _load_ssm_cache()
+    entry = cache.get(cache_key)
+    if not refresh and entry:
+        try:
+            if datetime.fromisoformat(entry['expires']) > now:
+                return entry['value']
+        except (KeyError, TypeError, ValueError):
+            pass
+
     try:
         # click.echo(f"Debug: Querying SSM path: {param_path}")
         response = ssm_client.get_parameter(Name=param_path)
-        return response['Parameter']['Value']
+        ami_id = response['Parameter']['Value']
+        cache[cache_key] = {'value': ami_id, 'expires': (now + SSM_CACHE_TTL).isoformat()}
+        _save_ssm_cache(cache)
+        return ami_id
     except Exception as e:
         click.echo(click.style(f"Error fetching AMI from SSM: {e}", fg="red"))
         raise e
 
 def count_our_instances():
     """
-    Counts how many running instances were created by this CLI.
-    It uses the tags defined in utils.py to identify 'our' instances.
+    Counts how many live instances were created by this CLI.
+    Both the tag and the state are filtered by AWS, so we only count what comes back.
     """
-    count = 0
-    # Filter only for running or pending instances (ignore terminated ones)
-    instances = ec2.instances.filter(
+    paginator = ec2_client.get_paginator('describe_instances')
+    pages = paginator.paginate(
         Filters=[
-            {
-                'Name': 'instance-state-name',
-                'Values': ['running', 'pending', 'stopped', 'stopping']
-            }
-        ]
+            {'Name': 'tag:' + TAG_KEY, 'Values': [TAG_VALUE]},
+            # Ignore terminated ones
+            {'Name': 'instance-state-name', 'Values': ['running', 'pending', 'stopped', 'stopping']}
+        ],
+        PaginationConfig={'PageSize': 1000}
     )
-
-    for instance in instances:
-        if instance.tags:
-            for tag in instance.tags:
-                # Check if the instance has our specific Creator tag
-                if tag['Key'] == TAG_KEY and tag['Value'] == TAG_VALUE:
-                    count += 1
-    return count
+    return sum(1 for _ in pages.search('Reservations[].Instances[]'))
 
 
-def create_instance(instance_type, os_type, name):
+def create_instance(instance_type, os_type, name, refresh_cache=False):
     """
     Main logic to create an EC2 instance.
     Enforces policies: Max 2 instances, specific types only.
@@ -68,9 +112,10 @@ def create_instance(instance_type, os_type, name):
             fg="red"))
         return
 
+    # Only look up the AMI once the limit check passed (usually a disk cache hit, not an SSM call)
     click.echo(f"Finding latest AMI for {os_type}...")
     try:
-        ami_id = get_latest_ami(os_type)
+        ami_id = get_latest_ami(os_type, refresh_cache)
         click.echo(f"Selected AMI: {ami_id}")
     except Exception as e:
         click.echo(click.style(f"Error finding AMI: {e}", fg="red"))
@@ -105,71 +150,69 @@ def create_instance(instance_type, os_type, name):
         click.echo(click.style(f"AWS Error: {e}", fg="red"))
 
 
+def iter_instances():
+    """
+    Yields every EC2 instance created by this tool as a simple dict, page by page as AWS returns them.
+    """
+    # Filter instances that have our specific 'CreatedBy' tag (plain dicts via the client paginator)
+    paginator = ec2_client.get_paginator('describe_instances')
+    pages = paginator.paginate(
+        Filters=[{'Name': 'tag:' + TAG_KEY, 'Values': [TAG_VALUE]},
+                 {'Name': 'instance-state-name', 'Values': ['pending', 'running', 'stopping', 'stopped', 'shutting-down']}],
+        PaginationConfig={'PageSize': 1000}
+    )
+
+    for instance in pages.search('Reservations[].Instances[]'):
+        yield {
+            'id': instance['InstanceId'],
+            # Extract the 'Name' tag if it exists
+            'name': tags_to_dict(instance.get('Tags')).get('Name', "N/A"),
+            'type': instance['InstanceType'],
+            'state': instance['State']['Name'],
+            'ip': instance.get('PublicIpAddress', "N/A")
+        }
+
+
 def list_instances(print_table=True):
     """
     Lists all EC2 instances created by this tool.
+    With print_table=True, rows are drawn as soon as each page arrives.
     """
-    console = Console()
-    table = Table(show_header=True, header_style="bold magenta")
-    table.add_column("Instance ID", style="dim")
-    table.add_column("Name", style="white")
-    table.add_column("Type", style="cyan")
-    table.add_column("State", style="green")
-    table.add_column("Public IP", style="yellow")
-
-    if print_table:
-        click.echo("Fetching instances...")
-
     found_instances = []
 
     try:
-        # Filter instances that have our specific 'CreatedBy' tag
-        response = ec2.instances.filter(
-            Filters=[{'Name': 'tag:' + TAG_KEY, 'Values': [TAG_VALUE]},
-                     {'Name': 'instance-state-name', 'Values': ['pending', 'running', 'stopping', 'stopped', 'shutting-down']}
-              ]
-        )
+        # Internal use (cleanup / status) - just collect them
+        if not print_table:
+            return list(iter_instances())
 
-        for instance in response:
-            # Extract the 'Name' tag if it exists
-            name = "N/A"
-            if instance.tags:
-                for tag in instance.tags:
-                    if tag['Key'] == 'Name':
-                        name = tag['Value']
-                        break
-
-            # Save info for internal use (cleanup command)
-            info = {
-                'id': instance.id,
-                'name': name,
-                'type': instance.instance_type,
-                'state': instance.state['Name'],
-                'ip': instance.public_ip_address if instance.public_ip_address else "N/A"
-            }
-            found_instances.append(info)
-
-            # Add row to the table
-            table.add_row(
-                info['id'],
-                info['name'],
-                info['type'],
-                info['state'],
-                info['ip']
-            )
-
-        # Only print the table if asked (Default behavior)
-        if print_table:
-            if found_instances:
-                console.print(table)
-            else:
-                click.echo(click.style("No instances found with the platform-cli tag.", fg="yellow"))
+        click.echo("Fetching instances...")
+        rows = iter_instances()
+        first = next(rows, None)
+        if first is None:
+            click.echo(click.style("No instances found with the platform-cli tag.", fg="yellow"))
+            return []
+
+        from rich.live import Live
+
+        table = make_table([
+            ("Instance ID", "dim"),
+            ("Name", "white"),
+            ("Type", "cyan"),
+            ("State", "green"),
+            ("Public IP", "yellow"),
+        ])
+
+        # Stream the remaining pages into the live table
+        with Live(table, console=get_console(), refresh_per_second=4):
+            for info in itertools.chain([first], rows):
+                found_instances.append(info)
+                table.add_row(info['id'], info['name'], info['type'], info['state'], info['ip'])
 
         return found_instances
 
     except Exception as e:
         click.echo(click.style(f"AWS Error: {e}", fg="red"))
-        return []
+        return found_instances
 
 def stop_instance(identifier):
     """
@@ -183,25 +226,8 @@ def stop_instance(identifier):
         click.echo(f"Resolved ID: {instance_id}")
         click.echo(f"Attempting to stop instance {instance_id}...")
 
-        # Get the instance object
-        instance = ec2.Instance(instance_id)
-        instance.load()
-
-        # Validation: Check if the instance has our specific tag
-        is_ours = False
-        if instance.tags:
-            for tag in instance.tags:
-                if tag['Key'] == TAG_KEY and tag['Value'] == TAG_VALUE:
-                    is_ours = True
-                    break
-
-        if not is_ours:
-            click.echo(
-                click.style(f"Error: Access Denied! Instance {instance_id} was not created by this CLI.", fg="red"))
-            return
-
-        # Perform the action
-        instance.stop()
+        # Perform the action (ownership was verified while resolving the ID)
+        ec2_client.stop_instances(InstanceIds=[instance_id])
         click.echo(click.style(f"Success! Instance '{identifier}' ({instance_id}) is stopping...", fg="yellow"))
 
     except Exception as e:
@@ -220,37 +246,30 @@ def start_instance(identifier):
         click.echo(f"Resolved ID: {instance_id}")
         click.echo(f"Attempting to start instance {instance_id}...")
 
-        instance = ec2.Instance(instance_id)
-        instance.load()
-
-        # Validation
-        is_ours = False
-        if instance.tags:
-            for tag in instance.tags:
-                if tag['Key'] == TAG_KEY and tag['Value'] == TAG_VALUE:
-                    is_ours = True
-                    break
-
-        if not is_ours:
-            click.echo(
-                click.style(f"Error: Access Denied! Instance {instance_id} was not created by this CLI.", fg="red"))
-            return
-
-        # Perform the action
-        instance.start()
+        # Perform the action (ownership was verified while resolving the ID)
+        ec2_client.start_instances(InstanceIds=[instance_id])
         click.echo(click.style(f"Success! Instance '{identifier}' ({instance_id}) is starting...", fg="green"))
 
     except Exception as e:
         click.echo(click.style(f"Error: {e}", fg="red"))
 
+# Names/IDs resolve to the same instance for the whole (short-lived) CLI command
+@functools.cache
 def get_id_by_name(name_or_id):
     """
     Helper function to resolve an identifier (Name or ID) to a specific Instance ID.
     If input starts with 'i-', assume it's an ID.
     Otherwise, search for an instance with that 'Name' tag.
+    Either way, only instances created by this CLI are returned - callers don't need to re-check tags.
     """
-    # If it looks like an ID, return it as is
+    # If it looks like an ID, verify it carries our tag in the same single call
     if name_or_id.startswith("i-"):
+        response = ec2_client.describe_instances(
+            InstanceIds=[name_or_id],
+            Filters=[{'Name': 'tag:' + TAG_KEY, 'Values': [TAG_VALUE]}]
+        )
+        if not response['Reservations']:
+            raise Exception(f"Access Denied! Instance {name_or_id} was not created by this CLI.")
         return name_or_id
 
     # Search for instances with this Name AND our Creator tag
@@ -263,16 +282,17 @@ def get_id_by_name(name_or_id):
         # Don't find terminated ones
     ]
 
-    found_instances = list(ec2.instances.filter(Filters=filters))
+    pages = ec2_client.get_paginator('describe_instances').paginate(Filters=filters)
+    found_ids = list(pages.search('Reservations[].Instances[].InstanceId'))
 
-    if len(found_instances) == 0:
+    if len(found_ids) == 0:
         raise Exception(f"No instance found with name '{name_or_id}' (created by this CLI).")
 
-    if len(found_instances) > 1:
+    if len(found_ids) > 1:
         raise Exception(f"Multiple instances found with name '{name_or_id}'. Please use the Instance ID to be safe.")
 
     # If exactly one found, return its ID
-    return found_instances[0].id
+    return found_ids[0]
 
 
 def terminate_instance(identifier):
@@ -286,40 +306,42 @@ def terminate_instance(identifier):
         click.echo(f"Resolved ID: {instance_id}")
         click.echo(f"Attempting to terminate instance {instance_id}...")
 
-        instance = ec2.Instance(instance_id)
-        instance.load()
-
-        # Validation: Double check ownership tags (Safety first!)
-        is_ours = False
-        if instance.tags:
-            for tag in instance.tags:
-                if tag['Key'] == TAG_KEY and tag['Value'] == TAG_VALUE:
-                    is_ours = True
-                    break
-
-        if not is_ours:
-            click.echo(
-                click.style(f"Error: Access Denied! Instance {instance_id} was not created by this CLI.", fg="red"))
-            return
-
-        # Execute Termination
-        instance.terminate()
+        # Execute Termination (ownership was verified while resolving the ID)
+        ec2_client.terminate_instances(InstanceIds=[instance_id])
         click.echo(click.style(f"Success! Instance '{identifier}' ({instance_id}) is being terminated.", fg="red"))
 
     except Exception as e:
         click.echo(click.style(f"Error: {e}", fg="red"))
 
 
-def terminate_all_instances():
+def bulk_action(instance_ids, action, echo=click.echo):
+    """
+    Runs 'stop', 'start' or 'terminate' on many instances with one API call per 1000 IDs.
+    Callers must pass IDs that are already known to be ours.
+    """
+    api_call = getattr(ec2_client, f"{action}_instances")
+    for i in range(0, len(instance_ids), EC2_BATCH_SIZE):
+        batch = instance_ids[i:i + EC2_BATCH_SIZE]
+        try:
+            api_call(InstanceIds=batch)
+            for instance_id in batch:
+                echo(click.style(f"Instance {instance_id}: {action} requested.", fg="yellow"))
+        except Exception as e:
+            echo(click.style(f"Error: {e}", fg="red"))
+
+
+def terminate_all_instances(instances=None, echo=click.echo):
     """
     Finds and terminates ALL EC2 instances created by this CLI.
+    Pass the result of list_instances() to skip the scan, and 'echo' to redirect its output.
     """
-    click.echo("Scanning for EC2 instances to terminate...")
-    instances = list_instances(print_table=False)  # Reuse existing list logic
+    if instances is None:
+        echo("Scanning for EC2 instances to terminate...")
+        instances = list_instances(print_table=False)  # Reuse existing list logic
 
     if not instances:
-        click.echo(click.style("No EC2 instances found.", fg="yellow"))
+        echo(click.style("No EC2 instances found.", fg="yellow"))
         return
 
-    for inst in instances:
-        terminate_instance(inst['id'])
\ No newline at end of file
+    # Ownership was already checked by list_instances (tag filter) - terminate them all at once
+    bulk_action([inst['id'] for inst in instances], 'terminate', echo)
@@ -1,10 +1,12 @@
 import click
-import ec2 as ec2_ops
-import s3 as s3_ops
-import route53 as r53_ops
-import cleanup_ops
+
+# The AWS modules pull in boto3 and rich, which dominate startup time.
+# Each command imports the one it needs, so --help and typos stay fast.
+
 # --- Main Entry Point ---
 @click.group()
+# Hard-coded (matches setup.py) so --version doesn't look up package metadata
+@click.version_option('0.1', prog_name='ofek-cli')
 def cli():
     """
     Platform Engineering CLI Tool.
@@ -22,29 +24,40 @@ def ec2():
 @click.option('--type', default='t3.micro', help='Instance type (t3.micro / t2.small)')
 @click.option('--os', default='amazon-linux', type=click.Choice(['ubuntu', 'amazon-linux']), help='Operating System')
 @click.option('--name', required=True, help='Name of the instance')
-def create(type, os, name):
+@click.option('--refresh-cache', is_flag=True, help='Ignore the cached AMI lookup and ask SSM again')
+def create(type, os, name, refresh_cache):
     """
     Create a new EC2 instance.
     Enforces a limit of 2 instances and specific types.
     """
+    import ec2 as ec2_ops
     # Here is the connection! We pass the user inputs to our logic file.
-    ec2_ops.create_instance(type, os, name)
+    ec2_ops.create_instance(type, os, name, refresh_cache)
 
 @ec2.command()
 def list():
     """List all instances created by this CLI."""
+    import ec2 as ec2_ops
     ec2_ops.list_instances()
 
+@ec2.command()
+def cleanup_cache():
+    """Remove the cached AMI lookups."""
+    import ec2 as ec2_ops
+    ec2_ops.clear_ssm_cache()
+
 @ec2.command()
 @click.argument('identifier')
 def stop(identifier):
     """Stop an EC2 instance (Only if created by CLI)."""
+    import ec2 as ec2_ops
     ec2_ops.stop_instance(identifier)
 
 @ec2.command()
 @click.argument('identifier')
 def start(identifier):
     """Start an EC2 instance (Only if created by CLI)."""
+    import ec2 as ec2_ops
     ec2_ops.start_instance(identifier)
 
 @ec2.command()
@@ -54,20 +67,13 @@ def terminate(identifier):
 
     # Safety Prompt
     if click.confirm(f"⚠️  WARNING: Are you sure you want to PERMANENTLY terminate {identifier}?"):
+        import ec2 as ec2_ops
         ec2_ops.terminate_instance(identifier)
     else:
         click.echo("Operation cancelled.")
 
-@ec2.command()
-@click.argument('identifier')
-def delete(identifier):
-    """Terminate an EC2 instance (Irreversible!)."""
-
-    # Safety Prompt: Force the user to confirm the action
-    if click.confirm(f"WARNING: Are you sure you want to PERMANENTLY delete {identifier}?"):
-        ec2_ops.terminate_instance(identifier)
-    else:
-        click.echo("Operation cancelled.")
+# 'delete' is an alias - same command object, no second implementation
+ec2.add_command(terminate, name='delete')
 
 # --- S3 Group ---
 @cli.group()
@@ -83,6 +89,7 @@ def create(name_prefix, public):
     Create a new S3 bucket (Private by default).
     The name will be suffixed with random characters for uniqueness.
     """
+    import s3 as s3_ops
     s3_ops.create_bucket(name_prefix, public)
 
 @s3.command()
@@ -93,11 +100,13 @@ def upload(bucket_name, file_path):
     Upload a file to a bucket (Only if created by CLI).
     Usage: ofek-cli s3 upload <bucket_name> <path_to_file>
     """
+    import s3 as s3_ops
     s3_ops.upload_file(bucket_name, file_path)
 
 @s3.command()
 def list():
     """List S3 buckets created by this CLI."""
+    import s3 as s3_ops
     s3_ops.list_buckets()
 
 @s3.command()
@@ -108,6 +117,7 @@ def delete(bucket_name, force):
     Delete an S3 bucket (Only if created by CLI).
     """
     if click.confirm(f"WARNING: Are you sure you want to delete '{bucket_name}'?"):
+        import s3 as s3_ops
         s3_ops.delete_bucket(bucket_name, force)
     else:
         click.echo("Operation cancelled.")
@@ -122,6 +132,7 @@ def route53():
 @click.argument('domain_name')
 def create_zone(domain_name):
     """Create a new Public Hosted Zone."""
+    import route53 as r53_ops
     r53_ops.create_hosted_zone(domain_name)
 
 @route53.command()
@@ -129,11 +140,13 @@ def create_zone(domain_name):
 def delete_zone(zone_id):
     """Delete a Hosted Zone (Must be empty)."""
     if click.confirm(f"Are you sure you want to delete zone {zone_id}?"):
+        import route53 as r53_ops
         r53_ops.delete_hosted_zone(zone_id)
 
 @route53.command()
 def list_zones():
     """List Hosted Zones created by this tool."""
+    import route53 as r53_ops
     r53_ops.list_zones()
 
 @route53.command()
@@ -142,6 +155,7 @@ def list_zones():
 @click.argument('ip_address')
 def add_record(zone_id, record_name, ip_address):
     """Add an A-Record (Verified IPs only)."""
+    import route53 as r53_ops
     r53_ops.create_record(zone_id, record_name, ip_address)
 
 @route53.command()
@@ -151,12 +165,34 @@ def add_record(zone_id, record_name, ip_address):
 def delete_record(zone_id, record_name, ip_address):
     """Delete an A-Record."""
     if click.confirm(f"Delete record {record_name} -> {ip_address}?"):
+        import route53 as r53_ops
         r53_ops.delete_record(zone_id, record_name, ip_address)
 
+@route53.command()
+@click.argument('zone_id')
+@click.argument('records', nargs=-1, required=True)
+@click.option('--wait', is_flag=True, help="Wait until Route53 has applied the deletions.")
+def delete_records(zone_id, records, wait):
+    """
+    Delete many A-Records at once.
+    Usage: ofek-cli route53 delete-records <zone_id> www.example.com=1.2.3.4 api.example.com=1.2.3.5
+    """
+    pairs = []
+    for record in records:
+        name, sep, ip_address = record.partition('=')
+        if not sep or not name or not ip_address:
+            raise click.BadParameter(f"'{record}' is not in NAME=IP form.", param_hint='RECORDS')
+        pairs.append((name, ip_address))
+
+    if click.confirm(f"Delete {len(pairs)} record(s) from zone {zone_id}?"):
+        import route53 as r53_ops
+        r53_ops.delete_records_bulk(zone_id, pairs, wait)
+
 @route53.command()
 @click.argument('zone_id')
 def list_records(zone_id):
     """List all DNS records in a Hosted Zone."""
+    import route53 as r53_ops
     r53_ops.list_records(zone_id)
 
 @cli.command()
@@ -165,6 +201,7 @@ def status():
     📊  Shows a dashboard of ALL active resources.
     Lists EC2 instances, S3 buckets, and Route53 zones managed by this tool.
     """
+    import cleanup_ops
     cleanup_ops.show_inventory()
 
 @cli.command()
@@ -174,6 +211,7 @@ def cleanup(yes):
     ☢️  DANGER: Deletes ALL resources created by this tool.
     Shows a preview of resources to be deleted before executing.
     """
+    import cleanup_ops
     cleanup_ops.execute_cleanup(yes)
 
 if __name__ == '__main__':
@@ -1,51 +1,104 @@
 import click
-from botocore.exceptions import ClientError
-from rich.console import Console
-from rich.table import Table
-from utils import get_boto3_client, get_common_tags, TAG_KEY, TAG_VALUE
+import functools
+import ipaddress
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError, WaiterError
+from utils import get_boto3_client, get_common_tags, get_console, make_table, is_managed, tags_to_dict, TAG_KEY, TAG_VALUE
 from datetime import datetime
 
-# We need Route53 to manage DNS, and EC2 to validate IPs
-r53_client = get_boto3_client('route53')
-ec2_client = get_boto3_client('ec2')
+
+# We need Route53 to manage DNS, and EC2 to validate IPs.
+# Clients are built on first use (and cached in utils), not at import time.
+def _r53():
+    return get_boto3_client('route53')
+
+def _ec2():
+    return get_boto3_client('ec2')
+
+# Route53 is a global service - its tags are only visible to the tagging API in us-east-1
+def _tagging():
+    return get_boto3_client('resourcegroupstaggingapi', 'us-east-1')
+
+# Parallel tag lookups when scanning zones (the client pool holds 50 connections)
+SCAN_WORKERS = 16
+# Route53 accepts up to 10 zone IDs per list_tags_for_resources call
+R53_TAG_BATCH = 10
+# ...and up to 1000 records (values) per change_resource_record_sets call
+R53_CHANGE_BATCH = 1000
+
+# Fixed describe_instances filters for the IP check (only the IP changes per call)
+OWNERSHIP_TAG_FILTER = {'Name': f'tag:{TAG_KEY}', 'Values': [TAG_VALUE]}
+RUNNING_FILTER = {'Name': 'instance-state-name', 'Values': ['running']}
 
 
 # --- Helper Functions ---
+def fetch_zone_tags(zone_ids):
+    """
+    Fetches the tags of many Hosted Zones using the batch API.
+    Returns a dict of {zone_id: {key: value}} - one HTTP call per 10 zones, sent in parallel.
+    """
+    chunks = [zone_ids[i:i + R53_TAG_BATCH] for i in range(0, len(zone_ids), R53_TAG_BATCH)]
+    if not chunks:
+        return {}
+
+    def fetch(chunk):
+        return _r53().list_tags_for_resources(ResourceType='hostedzone', ResourceIds=chunk)
+
+    zone_tags = {}
+    with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(chunks))) as executor:
+        for resp in executor.map(fetch, chunks):
+            for tag_set in resp['ResourceTagSets']:
+                zone_tags[tag_set['ResourceId']] = tags_to_dict(tag_set['Tags'])
+    return zone_tags
+
 def validate_zone_ownership(zone_id):
     """
     Validates that the Hosted Zone was created by this CLI.
+    Answers are cached for the life of the process - tags don't change under a single command.
     """
     try:
-        tags_response = r53_client.list_tags_for_resource(
-            ResourceType='hostedzone',
-            ResourceId=zone_id
-        )
-        for tag in tags_response['ResourceTagSet']['Tags']:
-            if tag['Key'] == TAG_KEY and tag['Value'] == TAG_VALUE:
-                return True
-        return False
+        return _zone_is_ours(zone_id)
     except ClientError:
+        # Not cached - a throttle or timeout must not stick as 'not ours'
         return False
 
+
+@functools.cache
+def _zone_is_ours(zone_id):
+    tags = fetch_zone_tags([zone_id]).get(zone_id, {})
+    return tags.get(TAG_KEY) == TAG_VALUE
+
+
 def validate_ip_ownership(ip_address):
     """
     Checks if the given IP belongs to an EC2 instance created by OUR tool.
+    Answers are cached for the life of the process; errors are not.
     """
     try:
-        response = ec2_client.describe_instances(
-            Filters=[
-                {'Name': 'ip-address', 'Values': [ip_address]},
-                {'Name': 'tag:' + TAG_KEY, 'Values': [TAG_VALUE]},
-                {'Name': 'instance-state-name', 'Values': ['running']}
-            ]
-        )
-        for reservation in response['Reservations']:
-            if reservation['Instances']:
-                return True
-        return False
+        return _ip_is_ours(ip_address)
     except ClientError:
         return False
 
+
+@functools.cache
+def _ip_is_ours(ip_address):
+    # Malformed or private addresses can never be an instance's public IP - skip the API call
+    try:
+        if not ipaddress.IPv4Address(ip_address).is_global:
+            return False
+    except ValueError:
+        return False
+
+    response = _ec2().describe_instances(
+        Filters=[
+            {'Name': 'ip-address', 'Values': [ip_address]},
+            OWNERSHIP_TAG_FILTER,
+            RUNNING_FILTER
+        ]
+    )
+    # The filters already did the matching - any instance back means it's ours
+    return any(r['Instances'] for r in response['Reservations'])
+
 # --- Core Functions ---
 
 def create_hosted_zone(domain_name):
@@ -61,22 +114,24 @@ def create_hosted_zone(domain_name):
 
     # --- Step 1: Check for duplicates (Idempotency) ---
     try:
-        # Fetch all existing zones to check for duplicates
-        existing_zones = r53_client.list_hosted_zones()['HostedZones']
+        # Zones are listed in name order, so asking for this name returns its
+        # zones first - page on only while the results still carry the same name
+        page = _r53().list_hosted_zones_by_name(DNSName=domain_name)
+        existing_zones = page['HostedZones']
+        while page.get('IsTruncated') and page.get('NextDNSName') == domain_name:
+            page = _r53().list_hosted_zones_by_name(DNSName=domain_name,
+                                                    HostedZoneId=page['NextHostedZoneId'])
+            existing_zones += page['HostedZones']
 
         for zone in existing_zones:
             if zone['Name'] == domain_name:
                 # Check if this zone is managed by our CLI (check tags)
-                zone_id = zone['Id'].split('/')[-1]
+                zone_id = zone['Id'].rsplit('/', 1)[-1]
                 try:
-                    tags = r53_client.list_tags_for_resource(ResourceType='hostedzone', ResourceId=zone_id)
+                    tags = _r53().list_tags_for_resource(ResourceType='hostedzone', ResourceId=zone_id)
                     tag_list = tags['ResourceTagSet']['Tags']
 
-                    is_ours = False
-                    for tag in tag_list:
-                        if tag['Key'] == TAG_KEY and tag['Value'] == TAG_VALUE:
-                            is_ours = True
-                            break
+                    is_ours = is_managed(tag_list)
 
                     if is_ours:
                         click.echo(
@@ -96,7 +151,7 @@ def create_hosted_zone(domain_name):
         # Create a unique caller reference to allow safe retries
         ref = f"{domain_name}-{datetime.now().timestamp()}"
 
-        response = r53_client.create_hosted_zone(
+        response = _r53().create_hosted_zone(
             Name=domain_name,
             CallerReference=ref,
             HostedZoneConfig={
@@ -105,10 +160,10 @@ def create_hosted_zone(domain_name):
             }
         )
 
-        zone_id = response['HostedZone']['Id'].split('/')[-1]
+        zone_id = response['HostedZone']['Id'].rsplit('/', 1)[-1]
 
         # --- Step 3: Tag the Resource ---
-        r53_client.change_tags_for_resource(
+        _r53().change_tags_for_resource(
             ResourceType='hostedzone',
             ResourceId=zone_id,
             AddTags=[
@@ -118,6 +173,9 @@ def create_hosted_zone(domain_name):
             ]
         )
 
+        # A lookup made before the tags existed must not hide the new zone
+        _zone_is_ours.cache_clear()
+
         click.echo(click.style("Success! Hosted Zone created.", fg="green"))
         click.echo(f"Zone ID: {zone_id}")
 
@@ -143,7 +201,7 @@ def delete_hosted_zone(zone_id):
 
     click.echo(f"Attempting to delete zone '{zone_id}'...")
     try:
-        r53_client.delete_hosted_zone(Id=zone_id)
+        _r53().delete_hosted_zone(Id=zone_id)
         click.echo(click.style(f"Success! Zone '{zone_id}' deleted.", fg="green"))
     except ClientError as e:
         if "HostedZoneNotEmpty" in str(e):
@@ -167,7 +225,7 @@ def create_record(zone_id, record_name, ip_address):
         return
 
     try:
-        r53_client.change_resource_record_sets(
+        _r53().change_resource_record_sets(
             HostedZoneId=zone_id,
             ChangeBatch={
                 'Comment': 'Created by Platform-CLI',
@@ -197,7 +255,7 @@ def delete_record(zone_id, record_name, ip_address):
 
     click.echo(f"Deleting record '{record_name}' pointing to {ip_address}...")
     try:
-        r53_client.change_resource_record_sets(
+        _r53().change_resource_record_sets(
             HostedZoneId=zone_id,
             ChangeBatch={
                 'Changes': [{
@@ -216,24 +274,92 @@ def delete_record(zone_id, record_name, ip_address):
         click.echo(click.style(f"AWS Error: {e}", fg="red"))
 
 
+def _change_batches(record_sets):
+    """Splits record sets into batches of at most 1000 records (values) each."""
+    batch, size = [], 0
+    for record_set in record_sets:
+        count = max(1, len(record_set.get('ResourceRecords', [])))  # alias records have none
+        if batch and size + count > R53_CHANGE_BATCH:
+            yield batch
+            batch, size = [], 0
+        batch.append(record_set)
+        size += count
+    if batch:
+        yield batch
+
+
+def _delete_record_sets(zone_id, record_sets):
+    """
+    Deletes many record sets with as few change_resource_record_sets calls as possible.
+    Returns the ID of the last submitted change. No ownership check - callers do that.
+    """
+    change_id = None
+    for batch in _change_batches(record_sets):
+        response = _r53().change_resource_record_sets(
+            HostedZoneId=zone_id,
+            ChangeBatch={'Changes': [{'Action': 'DELETE', 'ResourceRecordSet': r} for r in batch]}
+        )
+        change_id = response['ChangeInfo']['Id']
+    return change_id
+
+
+def delete_records_bulk(zone_id, records, wait=False):
+    """
+    Deletes many A-Records in one go. records is a list of (name, ip_address) pairs.
+    Pairs with the same name are one multi-value record set and are deleted together.
+    The zone is checked once, and Route53 gets one call per 1000 records.
+    With wait=True, blocks until Route53 has applied the last batch.
+    """
+    if not validate_zone_ownership(zone_id):
+        click.echo(click.style(f"Error: Access Denied! Zone '{zone_id}' was not created by this CLI.", fg="red"))
+        return
+
+    # Route53 rejects a batch that deletes the same record set twice - group the IPs by name
+    record_sets = {}
+    for name, ip_address in records:
+        record_set = record_sets.setdefault(name.rstrip('.').lower(), {
+            'Name': name, 'Type': 'A', 'TTL': 300, 'ResourceRecords': []
+        })
+        if {'Value': ip_address} not in record_set['ResourceRecords']:
+            record_set['ResourceRecords'].append({'Value': ip_address})
+    record_sets = list(record_sets.values())
+    if not record_sets:
+        return
+
+    click.echo(f"Deleting {len(record_sets)} record set(s)...")
+    deleted = 0
+    try:
+        # One batch at a time, so a failure can say how much already went through
+        for batch in _change_batches(record_sets):
+            change_id = _delete_record_sets(zone_id, batch)
+            deleted += len(batch)
+    except ClientError as e:
+        click.echo(click.style(f"AWS Error: {e}", fg="red"))
+        if deleted:
+            click.echo(click.style(f"{deleted} of {len(record_sets)} record set(s) were deleted before the failure.",
+                                   fg="yellow"))
+        return
+
+    click.echo(click.style(f"Success! {deleted} record set(s) deleted.", fg="green"))
+    if wait:
+        try:
+            _r53().get_waiter('resource_record_sets_changed').wait(Id=change_id)
+            click.echo("Route53 has applied the changes.")
+        except (ClientError, WaiterError) as e:
+            click.echo(click.style(f"The deletions were accepted, but waiting for them failed: {e}", fg="yellow"))
+
+
 def list_zones():
     """Lists only CLI-created zones."""
-    console = Console()
-    table = Table(show_header=True, header_style="bold magenta")
-    table.add_column("Zone ID", style="dim")
-    table.add_column("Domain Name", style="white")
+    table = make_table([("Zone ID", "dim"), ("Domain Name", "white")])
 
     try:
-        zones = r53_client.list_hosted_zones()['HostedZones']
-        found_any = False
+        zones = find_managed_zones()
         for zone in zones:
-            zone_id = zone['Id'].split('/')[-1]
-            if validate_zone_ownership(zone_id):
-                found_any = True
-                table.add_row(zone_id, zone['Name'])
+            table.add_row(zone['id'], zone['name'])
 
-        if found_any:
-            console.print(table)
+        if zones:
+            get_console().print(table)
         else:
             click.echo("No zones found.")
     except ClientError as e:
@@ -247,79 +373,99 @@ def list_records(zone_id):
         click.echo(click.style(f"Error: Access Denied! Zone '{zone_id}' not created by CLI.", fg="red"))
         return
 
-    console = Console()
-    table = Table(show_header=True, header_style="bold blue")
-    table.add_column("Name", style="white")
-    table.add_column("Type", style="cyan")
-    table.add_column("Value", style="green")
+    from rich.live import Live
+
+    table = make_table([("Name", "white"), ("Type", "cyan"), ("Value", "green")], header_style="bold blue")
 
     try:
-        response = r53_client.list_resource_record_sets(HostedZoneId=zone_id)
-        for r in response['ResourceRecordSets']:
-            vals = ", ".join([x['Value'] for x in r.get('ResourceRecords', [])])
-            table.add_row(r['Name'], r['Type'], vals)
-        console.print(table)
+        # A single call stops at 300 records - page through them and draw each page as it arrives
+        paginator = _r53().get_paginator('list_resource_record_sets')
+        pages = paginator.paginate(HostedZoneId=zone_id, PaginationConfig={'PageSize': 300})
+        with Live(table, console=get_console(), refresh_per_second=4):
+            for page in pages:
+                for r in page['ResourceRecordSets']:
+                    vals = ", ".join([x['Value'] for x in r.get('ResourceRecords', [])])
+                    table.add_row(r['Name'], r['Type'], vals)
     except ClientError as e:
         click.echo(click.style(f"AWS Error: {e}", fg="red"))
 
 
-def get_managed_zones():
+def get_tagged_zone_ids():
+    """
+    Asks the Resource Groups Tagging API for every Hosted Zone carrying our tag.
+    One paginated call replaces the per-zone tag lookups.
+    """
+    paginator = _tagging().get_paginator('get_resources')
+    pages = paginator.paginate(
+        TagFilters=[{'Key': TAG_KEY, 'Values': [TAG_VALUE]}],
+        ResourceTypeFilters=['route53:hostedzone']
+    )
+    # ARN format: arn:aws:route53:::hostedzone/<zone_id>
+    return {arn.rsplit('/', 1)[-1] for arn in pages.search('ResourceTagMappingList[].ResourceARN')}
+
+
+def find_managed_zones():
     """
     Returns a list of Route53 Zones (ID, Name) created by this CLI.
+    Ownership comes from the tagging API, or from batched tag lookups
+    if we may not call it. Raises ClientError if the scan fails.
     """
-    found_zones = []
+    pages = _r53().get_paginator('list_hosted_zones').paginate()
+    zones = list(pages.search('HostedZones[]'))
+    zone_ids = [zone['Id'].rsplit('/', 1)[-1] for zone in zones]
+
     try:
-        zones = r53_client.list_hosted_zones()['HostedZones']
-        for zone in zones:
-            zone_id = zone['Id'].split('/')[-1]
-            if validate_zone_ownership(zone_id):
-                found_zones.append({'id': zone_id, 'name': zone['Name']})
+        ours = get_tagged_zone_ids()
     except ClientError:
-        pass
+        # No tag:GetResources permission - check the zones' tags ourselves
+        zone_tags = fetch_zone_tags(zone_ids)
+        ours = {z_id for z_id in zone_ids if zone_tags.get(z_id, {}).get(TAG_KEY) == TAG_VALUE}
 
-    return found_zones
+    return [
+        {'id': zone_id, 'name': zone['Name']}
+        for zone, zone_id in zip(zones, zone_ids)
+        if zone_id in ours
+    ]
 
 
-def delete_all_zones():
+def get_managed_zones():
     """
-    Finds and deletes ALL Route53 Zones created by this CLI.
+    Returns a list of Route53 Zones (ID, Name) created by this CLI.
     """
-    click.echo("Scanning for Route53 Zones to delete...")
     try:
-        zones = r53_client.list_hosted_zones()['HostedZones']
-        found_any = False
+        return find_managed_zones()
+    except ClientError:
+        return []
 
+
+def delete_all_zones(zones=None, echo=click.echo):
+    """
+    Finds and deletes ALL Route53 Zones created by this CLI.
+    Pass the result of get_managed_zones() to skip the scan, and 'echo' to redirect its output.
+    """
+    if zones is None:
+        echo("Scanning for Route53 Zones to delete...")
+        zones = get_managed_zones()
+
+    if not zones:
+        echo(click.style("No Route53 zones found.", fg="yellow"))
+        return
+
+    try:
         for zone in zones:
-            zone_id = zone['Id'].split('/')[-1]
-
-            # Check ownership
-            if validate_zone_ownership(zone_id):
-                found_any = True
-                click.echo(f"Cleaning up Zone: {zone['Name']} ({zone_id})...")
-
-                # 1. Delete all records (except NS/SOA)
-                records = r53_client.list_resource_record_sets(HostedZoneId=zone_id)
-                changes = []
-                for r in records['ResourceRecordSets']:
-                    if r['Type'] not in ['NS', 'SOA']:
-                        changes.append({
-                            'Action': 'DELETE',
-                            'ResourceRecordSet': r
-                        })
-
-                if changes:
-                    r53_client.change_resource_record_sets(
-                        HostedZoneId=zone_id,
-                        ChangeBatch={'Changes': changes}
-                    )
-                    click.echo(f" - Deleted {len(changes)} records.")
-
-                # 2. Delete the Zone itself
-                r53_client.delete_hosted_zone(Id=zone_id)
-                click.echo(click.style(f" - Zone deleted.", fg="green"))
-
-        if not found_any:
-            click.echo(click.style("No Route53 zones found.", fg="yellow"))
+            zone_id = zone['id']
+            echo(f"Cleaning up Zone: {zone['name']} ({zone_id})...")
+
+            # 1. Delete all records (except NS/SOA) - paged, in batches of up to 1000 changes
+            pages = _r53().get_paginator('list_resource_record_sets').paginate(HostedZoneId=zone_id)
+            records = [r for r in pages.search('ResourceRecordSets[]') if r['Type'] not in ['NS', 'SOA']]
+            if records:
+                _delete_record_sets(zone_id, records)
+                echo(f" - Deleted {len(records)} records.")
+
+            # 2. Delete the Zone itself
+            _r53().delete_hosted_zone(Id=zone_id)
+            echo(click.style(f" - Zone deleted.", fg="green"))
 
     except ClientError as e:
-        click.echo(click.style(f"AWS Error: {e}", fg="red"))
\ No newline at end of file
+        echo(click.style(f"AWS Error: {e}", fg="red"))
@@ -1,13 +1,46 @@
 import click
+import itertools
 import os
-from botocore.exceptions import ClientError
-from rich.console import Console
-from rich.table import Table
-from utils import get_boto3_resource, get_boto3_client, get_common_tags, generate_bucket_name, TAG_KEY, TAG_VALUE
+import stat
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError, WaiterError
+from utils import get_boto3_client, get_common_tags, get_console, make_table, generate_bucket_name, is_managed, TAG_KEY, TAG_VALUE
 import json
 # Initialize S3 connections
-s3_resource = get_boto3_resource('s3')
 s3_client = get_boto3_client('s3')
+tagging_client = get_boto3_client('resourcegroupstaggingapi')
+
+# Parallel tag lookups when scanning buckets (the client pool holds 50 connections)
+SCAN_WORKERS = 16
+# S3 accepts up to 1000 keys per delete_objects call
+S3_DELETE_BATCH = 1000
+# Parallel delete_objects calls per bucket
+S3_DELETE_WORKERS = 4
+# Buckets emptied at once by delete_all_buckets (x S3_DELETE_WORKERS stays under the 50-connection pool)
+BUCKET_DELETE_WORKERS = 8
+
+# Short poll for a new bucket to become visible (default is 5s x 20 attempts)
+BUCKET_READY_WAIT = {'Delay': 1, 'MaxAttempts': 10}
+
+# Settings every new bucket gets (same objects reused on every create)
+SSE_CONFIG = {'Rules': [{'ApplyServerSideEncryptionByDefault': {'SSEAlgorithm': 'AES256'}}]}
+PRIVATE_ACCESS_BLOCK = {
+    'BlockPublicAcls': True,
+    'IgnorePublicAcls': True,
+    'BlockPublicPolicy': True,
+    'RestrictPublicBuckets': True
+}
+
+# Big files go up in 16MB parts, many parts at once; smaller ones as a single put_object
+MB = 1024 * 1024
+MULTIPART_THRESHOLD = 16 * MB
+UPLOAD_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=16 * MB,
+    max_concurrency=min(32, (os.cpu_count() or 1) * 4),
+    use_threads=True
+)
 
 
 def create_bucket(bucket_prefix, is_public=False):
@@ -31,26 +64,43 @@ def create_bucket(bucket_prefix, is_public=False):
     try:
         # 3. Create
         s3_client.create_bucket(Bucket=bucket_name)
-        s3_client.get_waiter('bucket_exists').wait(Bucket=bucket_name)
-
-        # 4. Tags
-        s3_client.put_bucket_tagging(
-            Bucket=bucket_name,
-            Tagging={'TagSet': get_common_tags()}
-        )
+        try:
+            s3_client.get_waiter('bucket_exists').wait(Bucket=bucket_name, WaiterConfig=BUCKET_READY_WAIT)
+        except WaiterError:
+            # The bucket was created - try to tag it anyway; if it still isn't
+            # visible the tagging fails and the bucket is rolled back below
+            click.echo(click.style(f"Bucket '{bucket_name}' is slow to appear, continuing...", fg="yellow"))
+
+        # 4. Tags - first, and they must stick: an untagged bucket is invisible to
+        # list/cleanup, so never go on (least of all make it public) without them.
+        # The steps below run one after another - S3 can reject concurrent config
+        # PUTs on one bucket (409 OperationAborted).
+        try:
+            s3_client.put_bucket_tagging(
+                Bucket=bucket_name,
+                Tagging={'TagSet': get_common_tags()}
+            )
+        except ClientError as e:
+            click.echo(click.style(f"Failed to apply tags: {e}", fg="red"))
+            try:
+                s3_client.delete_bucket(Bucket=bucket_name)
+                click.echo(click.style(f"Removed the untagged bucket '{bucket_name}'.", fg="yellow"))
+            except ClientError as e:
+                click.echo(click.style(
+                    f"Could not remove the untagged bucket '{bucket_name}': {e}\n"
+                    f"This tool cannot see it - delete it manually.", fg="red", bold=True))
+            return
 
         # 5. Encryption
         s3_client.put_bucket_encryption(
             Bucket=bucket_name,
-            ServerSideEncryptionConfiguration={
-                'Rules': [{'ApplyServerSideEncryptionByDefault': {'SSEAlgorithm': 'AES256'}}]
-            }
+            ServerSideEncryptionConfiguration=SSE_CONFIG
         )
-        click.echo(click.style(f"Encryption enabled (AES256).", fg="green"))
+        click.echo(click.style("Encryption enabled (AES256).", fg="green"))
 
         # --- 6. PUBLIC / PRIVATE LOGIC (UPDATED) ---
         if is_public:
-            # PUBLIC MODE
+            # PUBLIC MODE (the block must be gone before the policy is accepted)
             s3_client.delete_public_access_block(Bucket=bucket_name)
 
             bucket_policy = {
@@ -73,12 +123,7 @@ def create_bucket(bucket_prefix, is_public=False):
             # PRIVATE MODE
             s3_client.put_public_access_block(
                 Bucket=bucket_name,
-                PublicAccessBlockConfiguration={
-                    'BlockPublicAcls': True,
-                    'IgnorePublicAcls': True,
-                    'BlockPublicPolicy': True,
-                    'RestrictPublicBuckets': True
-                }
+                PublicAccessBlockConfiguration=PRIVATE_ACCESS_BLOCK
             )
             click.echo(click.style("Bucket set to PRIVATE (Secure).", fg="green"))
 
@@ -124,41 +169,25 @@ def create_bucket(bucket_prefix, is_public=False):
 def list_buckets():
     """
     Lists all buckets created by this tool.
+    Rows are drawn as soon as each bucket is confirmed.
     """
-    console = Console()
-    table = Table(show_header=True, header_style="bold cyan")
-    table.add_column("Bucket Name", style="white")
-    table.add_column("Creation Date", style="dim")
-
     click.echo("Fetching buckets (this might take a moment to scan tags)...")
 
-    found_any = False
-
     try:
-        for bucket in s3_resource.buckets.all():
-            try:
-                tag_set = s3_client.get_bucket_tagging(Bucket=bucket.name).get('TagSet', [])
-
-                is_ours = False
-                for tag in tag_set:
-                    if tag['Key'] == TAG_KEY and tag['Value'] == TAG_VALUE:
-                        is_ours = True
-                        break
+        rows = iter_managed_buckets()
+        first = next(rows, None)
+        if first is None:
+            click.echo(click.style("No buckets found created by platform-cli.", fg="yellow"))
+            return
 
-                if is_ours:
-                    found_any = True
-                    table.add_row(
-                        bucket.name,
-                        str(bucket.creation_date.strftime("%Y-%m-%d %H:%M:%S"))
-                    )
+        from rich.live import Live
 
-            except ClientError as e:
-                continue
+        table = make_table([("Bucket Name", "white"), ("Creation Date", "dim")], header_style="bold cyan")
 
-        if found_any:
-            console.print(table)
-        else:
-            click.echo(click.style("No buckets found created by platform-cli.", fg="yellow"))
+        # Stream the remaining buckets into the live table
+        with Live(table, console=get_console(), refresh_per_second=10):
+            for bucket in itertools.chain([first], rows):
+                table.add_row(bucket['Name'], bucket['CreationDate'].strftime("%Y-%m-%d %H:%M:%S"))
 
     except ClientError as e:
         click.echo(click.style(f"AWS Error: {e}", fg="red"))
@@ -170,13 +199,23 @@ def upload_file(bucket_name, file_path):
     Enforces a STRICT policy: Can only upload to buckets created by this CLI.
     """
 
-    # 1. Local File Validation
-    if not os.path.exists(file_path):
+    # 1. Local File Validation (one stat gives us both existence and size)
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
         click.echo(click.style(f"Error: The file '{file_path}' does not exist.", fg="red"))
         return
+    except OSError as e:
+        click.echo(click.style(f"Error: Cannot read '{file_path}': {e.strerror}.", fg="red"))
+        return
+
+    if not stat.S_ISREG(file_stat.st_mode):
+        click.echo(click.style(f"Error: '{file_path}' is not a regular file.", fg="red"))
+        return
+    file_size = file_stat.st_size
 
     file_name = os.path.basename(file_path)
-    click.echo(f"Preparing to upload '{file_name}' to bucket '{bucket_name}'...")
+    click.echo(f"Preparing to upload '{file_name}' ({file_size / MB:.1f} MB) to bucket '{bucket_name}'...")
 
     # 2. Bucket Validation (Check Tags)
     try:
@@ -184,11 +223,7 @@ def upload_file(bucket_name, file_path):
         tag_set = s3_client.get_bucket_tagging(Bucket=bucket_name).get('TagSet', [])
 
         # Verify ownership
-        is_ours = False
-        for tag in tag_set:
-            if tag['Key'] == TAG_KEY and tag['Value'] == TAG_VALUE:
-                is_ours = True
-                break
+        is_ours = is_managed(tag_set)
 
         if not is_ours:
             click.echo(
@@ -196,8 +231,13 @@ def upload_file(bucket_name, file_path):
             return
 
         # 3. Perform Upload
-        # We use upload_file which handles large files automatically
-        s3_client.upload_file(file_path, bucket_name, file_name)
+        if file_size < MULTIPART_THRESHOLD:
+            # Small file - a single PUT, no transfer manager threads
+            with open(file_path, 'rb') as f:
+                s3_client.put_object(Bucket=bucket_name, Key=file_name, Body=f)
+        else:
+            # Large file - upload_file splits it into parts and sends them in parallel
+            s3_client.upload_file(file_path, bucket_name, file_name, Config=UPLOAD_CONFIG)
 
         click.echo(click.style(f"Success! File '{file_name}' uploaded to '{bucket_name}'.", fg="green"))
 
@@ -210,6 +250,35 @@ def upload_file(bucket_name, file_path):
             click.echo(click.style(f"Error: Bucket '{bucket_name}' does not exist.", fg="red"))
         else:
             click.echo(click.style(f"AWS Error: {e}", fg="red"))
+    except OSError as e:
+        # The file passed the stat but could not be read (permissions, removed meanwhile...)
+        click.echo(click.style(f"Error: Cannot read '{file_path}': {e.strerror}.", fg="red"))
+
+
+def empty_bucket(bucket_name):
+    """
+    Deletes every object version and delete marker in a bucket.
+    Uses delete_objects so each call removes up to 1000 keys instead of one,
+    and sends the batches in parallel while the next listing page is fetched.
+    """
+    paginator = s3_client.get_paginator('list_object_versions')
+
+    with ThreadPoolExecutor(max_workers=S3_DELETE_WORKERS) as executor:
+        futures = []
+        for page in paginator.paginate(Bucket=bucket_name):
+            entries = page.get('Versions', []) + page.get('DeleteMarkers', [])
+            to_delete = [{'Key': v['Key'], 'VersionId': v['VersionId']} for v in entries]
+
+            for i in range(0, len(to_delete), S3_DELETE_BATCH):
+                futures.append(executor.submit(
+                    s3_client.delete_objects,
+                    Bucket=bucket_name,
+                    Delete={'Objects': to_delete[i:i + S3_DELETE_BATCH], 'Quiet': True}
+                ))
+
+        # Surface the first failure (if any)
+        for future in futures:
+            future.result()
 
 
 def delete_bucket(bucket_name, force):
@@ -233,11 +302,7 @@ def delete_bucket(bucket_name, force):
                 return
             raise e
 
-        is_ours = False
-        for tag in tag_set:
-            if tag['Key'] == TAG_KEY and tag['Value'] == TAG_VALUE:
-                is_ours = True
-                break
+        is_ours = is_managed(tag_set)
 
         if not is_ours:
             click.echo(
@@ -245,13 +310,12 @@ def delete_bucket(bucket_name, force):
             return
 
         # 2. Empty the bucket (if needed)
-        bucket = s3_resource.Bucket(bucket_name)
-
         # Check if empty (we peek at versions now, not just objects)
         # Note: We check object_versions to catch hidden files too
-        version_count = sum(1 for _ in bucket.object_versions.limit(1))
+        peek = s3_client.list_object_versions(Bucket=bucket_name, MaxKeys=1)
+        is_empty = not peek.get('Versions') and not peek.get('DeleteMarkers')
 
-        if version_count > 0:
+        if not is_empty:
             if not force:
                 click.echo(click.style(f"Error: Bucket is not empty! Use --force to delete it and all its contents.",
                                        fg="yellow"))
@@ -259,73 +323,116 @@ def delete_bucket(bucket_name, force):
             else:
                 click.echo(click.style("Force delete enabled: Deleting ALL versions and markers...", fg="yellow"))
 
-                bucket.object_versions.all().delete()
+                empty_bucket(bucket_name)
 
         # 3. Delete the Bucket
-        bucket.delete()
+        s3_client.delete_bucket(Bucket=bucket_name)
         click.echo(click.style(f"Success! Bucket '{bucket_name}' deleted.", fg="red"))
 
     except ClientError as e:
         click.echo(click.style(f"AWS Error: {e}", fg="red"))
 
 
+def bucket_is_ours(bucket_name):
+    """Checks the bucket's tags. No tags / no access / no bucket all mean 'not ours'."""
+    try:
+        tags = s3_client.get_bucket_tagging(Bucket=bucket_name).get('TagSet', [])
+        return is_managed(tags)
+    except ClientError:
+        return False
+
+
+def get_tagged_bucket_names():
+    """
+    Asks the Resource Groups Tagging API for every bucket carrying our tag.
+    One paginated call replaces the per-bucket tag lookups.
+    """
+    paginator = tagging_client.get_paginator('get_resources')
+    pages = paginator.paginate(
+        TagFilters=[{'Key': TAG_KEY, 'Values': [TAG_VALUE]}],
+        ResourceTypeFilters=['s3']
+    )
+    # ARN format: arn:aws:s3:::<bucket_name>
+    return {arn.split(':::')[-1] for arn in pages.search('ResourceTagMappingList[].ResourceARN')}
+
+
+def iter_managed_buckets():
+    """
+    Yields the list_buckets entries (Name, CreationDate) of buckets created by this CLI.
+    Ownership comes from the tagging API, or from parallel per-bucket tag lookups
+    if we may not call it - then each bucket is yielded as soon as its check returns.
+    Raises ClientError if the bucket listing fails.
+    """
+    # Asking with a page size makes S3 include each bucket's region in the listing
+    pages = s3_client.get_paginator('list_buckets').paginate(PaginationConfig={'PageSize': 10000})
+    buckets = list(pages.search('Buckets[]'))
+    if not buckets:
+        return
+
+    try:
+        ours = get_tagged_bucket_names()
+    except ClientError:
+        # No tag:GetResources permission - check every bucket's tags ourselves
+        ours = None
+
+    # The tagging API only sees buckets in its own region - buckets from any other
+    # (or unknown) region still need their own tag check
+    region = tagging_client.meta.region_name
+    to_check = []
+    for bucket in buckets:
+        if ours is not None and bucket['Name'] in ours:
+            yield bucket
+        elif ours is None or bucket.get('BucketRegion') != region:
+            to_check.append(bucket)
+
+    if not to_check:
+        return
+    with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(to_check))) as executor:
+        futures = {executor.submit(bucket_is_ours, b['Name']): b for b in to_check}
+        for future in as_completed(futures):
+            if future.result():
+                yield futures[future]
+
+
 def get_managed_buckets():
     """
     Returns a list of S3 bucket names created by this CLI.
     """
-    found_buckets = []
     try:
-        # Use Client to list all buckets (Resource generic iteration can be slower/less detailed)
-        response = s3_client.list_buckets()
-
-        for bucket in response['Buckets']:
-            name = bucket['Name']
-            try:
-                # Use Client to fetch tags for each bucket
-                tags = s3_client.get_bucket_tagging(Bucket=name).get('TagSet', [])
-                for tag in tags:
-                    if tag['Key'] == TAG_KEY and tag['Value'] == TAG_VALUE:
-                        found_buckets.append(name)
-                        break
-            except ClientError:
-                # Continue if bucket has no tags or access is denied
-                continue
+        return [bucket['Name'] for bucket in iter_managed_buckets()]
     except ClientError:
-        pass
+        return []
+
 
-    return found_buckets
+def _delete_one(bucket_name):
+    """Empties one bucket (all versions and delete markers), then deletes it."""
+    empty_bucket(bucket_name)
+    s3_client.delete_bucket(Bucket=bucket_name)
 
 
-def delete_all_buckets():
+def delete_all_buckets(buckets=None, echo=click.echo):
     """
     Finds and deletes ALL S3 buckets created by this CLI.
     Forces deletion of objects and versions.
+    Pass the result of get_managed_buckets() to skip the scan, and 'echo' to redirect its output.
     """
-    click.echo("Scanning for S3 buckets to delete (this might take a moment)...")
-
     # Step 1: Find our buckets using the helper function
-    buckets_to_delete = get_managed_buckets()
+    if buckets is None:
+        echo("Scanning for S3 buckets to delete (this might take a moment)...")
+        buckets = get_managed_buckets()
 
-    if not buckets_to_delete:
-        click.echo(click.style("No S3 buckets found.", fg="yellow"))
+    if not buckets:
+        echo(click.style("No S3 buckets found.", fg="yellow"))
         return
 
-    # Step 2: Delete them using s3_resource
-    for bucket_name in buckets_to_delete:
-        try:
-            click.echo(f"Deleting bucket {bucket_name}...")
-
-            # Using s3_resource here because it handles object/version deletion easily
-            bucket = s3_resource.Bucket(bucket_name)
-
-            # Delete all versions (if versioning was enabled)
-            bucket.object_versions.delete()
-            # Delete all remaining objects
-            bucket.objects.all().delete()
-            # Delete the bucket itself
-            bucket.delete()
-
-            click.echo(click.style(f"Deleted {bucket_name}", fg="green"))
-
-        except ClientError as e:
-            click.echo(click.style(f"Failed to delete {bucket_name}: {e}", fg="red"))
\ No newline at end of file
+    # Step 2: Empty and delete them - several buckets at once
+    echo(f"Deleting {len(buckets)} bucket(s)...")
+    with ThreadPoolExecutor(max_workers=min(BUCKET_DELETE_WORKERS, len(buckets))) as executor:
+        futures = {executor.submit(_delete_one, name): name for name in buckets}
+        for future in as_completed(futures):
+            bucket_name = futures[future]
+            try:
+                future.result()
+                echo(click.style(f"Deleted {bucket_name}", fg="green"))
+            except ClientError as e:
+                echo(click.style(f"Failed to delete {bucket_name}: {e}", fg="red"))
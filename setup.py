@@ -8,7 +8,7 @@ setup(
         'Click',
         'boto3',
         'rich',
-        'streamlit',
+        'streamlit>=1.37',
         'setuptools'
     ],
     entry_points='''
@@ -1,31 +1,101 @@
 import boto3
+import functools
 import getpass
 import random
 import string
+import threading
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, PartialCredentialsError, ClientError
 import click
 
 TAG_KEY = "CreatedBy"
 TAG_VALUE = "OFEK-AWS-CLI"
 
+# Shared client settings:
+# - A bigger pool (default is 10) so parallel tag scans don't queue for a connection.
+# - TCP keepalive + short timeouts so idle connections are reused and dead ones fail fast.
+# - Adaptive retries back off client-side when AWS starts throttling us.
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=10,
+    retries={'mode': 'adaptive', 'total_max_attempts': 3}
+)
+
+@functools.cache
+def get_user_name():
+    """The current system username (looked up once per process)."""
+    return getpass.getuser()
+
+
 def get_common_tags():
     """
     Returns a list of tags that must be applied to every resource.
     Includes a dynamic 'Owner' tag based on the current system username.
+    A fresh list every call - callers append their own tags (e.g. Name).
     """
-    user_name = getpass.getuser()
+    user_name = get_user_name()
     return [
         {'Key': TAG_KEY, 'Value': TAG_VALUE},
         {'Key': 'owner', 'Value': user_name}
     ]
 
+_session = None
+# A boto3 Session is not thread-safe - clients are built lazily from worker threads
+# (and from Streamlit's session threads), so creation goes through this lock
+_session_lock = threading.RLock()
+
+
+def get_session():
+    """
+    Returns the single boto3 Session shared by every client and resource.
+    Credentials and service models are resolved once instead of once per client.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = boto3.Session()
+        return _session
+
+
+def tags_to_dict(tags):
+    """
+    Converts an AWS tag list ([{'Key': ..., 'Value': ...}]) into a plain dict.
+    Build it once per resource, then look up our tag / the Name tag with .get().
+    """
+    return {t['Key']: t['Value'] for t in tags or []}
+
+
+def is_managed(tags):
+    """True if an AWS tag list ([{'Key': ..., 'Value': ...}]) carries our CreatedBy tag."""
+    return any(t['Key'] == TAG_KEY and t['Value'] == TAG_VALUE for t in tags or [])
+
+
 def get_boto3_resource(service_name):
     """
     Connects to AWS and returns a boto3 'Resource' object.
+    Built once per service - every module importing it shares the same object.
+    """
+    # The lock covers the cache lookup too, so two threads never both build the same object
+    with _session_lock:
+        return _build_resource(service_name)
+
+
+def get_boto3_client(service_name, region_name=None):
+    """
+    Connects to AWS and returns a boto3 'Client' object.
+    region_name overrides the profile's region (e.g. for global services).
+    Built once per (service, region) - every module importing it shares the same client.
     """
+    with _session_lock:
+        return _build_client(service_name, region_name)
+
+
+@functools.cache
+def _build_resource(service_name):
     try:
-        session = boto3.Session()
-        return session.resource(service_name)
+        return get_session().resource(service_name, config=CLIENT_CONFIG)
     except (NoCredentialsError, PartialCredentialsError):
         click.echo(click.style("Error: AWS credentials not found. Please run 'aws configure'.", fg="red"))
         exit(1)
@@ -34,13 +104,10 @@ def get_boto3_resource(service_name):
         exit(1)
 
 
-def get_boto3_client(service_name):
-    """
-    Connects to AWS and returns a boto3 'Client' object.
-    """
+@functools.cache
+def _build_client(service_name, region_name):
     try:
-        session = boto3.Session()
-        return session.client(service_name)
+        return get_session().client(service_name, region_name=region_name, config=CLIENT_CONFIG)
     except (NoCredentialsError, PartialCredentialsError):
         click.echo(click.style("Error: AWS credentials not found. Please run 'aws configure'.", fg="red"))
         exit(1)
@@ -48,11 +115,35 @@ def get_boto3_client(service_name):
         click.echo(click.style(f"AWS Error: {e}", fg="red"))
         exit(1)
 
+# Characters allowed in the random bucket-name suffix (S3 names are lowercase)
+BUCKET_SUFFIX_CHARS = string.ascii_lowercase + string.digits
+
 def generate_bucket_name(prefix):
     """
     Generates a globally unique bucket name.
     S3 bucket names must be unique across ALL AWS accounts.
     Format: <prefix>-<6_random_chars>
     """
-    random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
-    return f"{prefix}-{random_suffix}"
\ No newline at end of file
+    random_suffix = ''.join(random.choices(BUCKET_SUFFIX_CHARS, k=6))
+    return f"{prefix}-{random_suffix}"
+
+# --- Table Rendering ---
+# rich is only imported by commands that actually draw a table.
+
+@functools.cache
+def get_console():
+    """Returns the single rich Console shared by every table in the CLI."""
+    from rich.console import Console
+    return Console()
+
+
+def make_table(columns, header_style="bold magenta"):
+    """
+    Builds an empty rich Table.
+    columns is a list of (header, style) pairs, e.g. [("Zone ID", "dim"), ("Domain Name", "white")].
+    """
+    from rich.table import Table
+    table = Table(show_header=True, header_style=header_style)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    return table